@@ -4,6 +4,8 @@ Handles coordinate mapping and pipetting workflows
 """
 
 import json
+import os
+import struct
 import threading
 import time
 from dataclasses import dataclass
@@ -61,6 +63,8 @@ class CoordinateMapper:
     # Well plate configuration from CLAUDE.md (default/legacy layout)
     ROWS = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
     COLUMNS = list(range(1, 16))  # 1-15 (extended for MicroChip layout)
+    _ROW_SET = frozenset(ROWS)
+    _COL_SET = frozenset(COLUMNS)
 
     # Motor configuration (steps per mm - adjust based on your stepper setup)
     STEPS_PER_MM_X = settings.get('STEPS_PER_MM_X')
@@ -101,12 +105,7 @@ class CoordinateMapper:
             Well ID (e.g., 'A1') or None if not at a well position
         """
         # Check stored layout coordinates first (per-layout mapping from config.json)
-        layout_keys = [CoordinateMapper.CURRENT_LAYOUT]
-        if CoordinateMapper.CURRENT_LAYOUT == 'wellplate':
-            layout_keys.append('vial')
-        layout_coords = {}
-        for key in layout_keys:
-            layout_coords.update(CoordinateMapper.LAYOUT_COORDINATES.get(key, {}))
+        layout_coords = CoordinateMapper._merged_layout_coords()
         for well_id, stored in layout_coords.items():
             if stored is not None:
                 if abs(coords.x - stored["x"]) < 1.0 and abs(coords.y - stored["y"]) < 1.0:
@@ -140,10 +139,10 @@ class CoordinateMapper:
         except ValueError:
             raise ValueError(f"Invalid column in well ID: {well_id}")
 
-        if row not in CoordinateMapper.ROWS:
+        if row not in CoordinateMapper._ROW_SET:
             raise ValueError(f"Invalid row '{row}'. Must be A-H")
         # Extended range for MicroChip layout (up to 15 columns)
-        if column < 1 or column > 15:
+        if column not in CoordinateMapper._COL_SET:
             raise ValueError(f"Invalid column {column}. Must be 1-15")
 
         return row, column
@@ -214,24 +213,32 @@ class CoordinateMapper:
         return WellCoordinates(x=x, y=y, z=0.0)
 
     @staticmethod
-    def well_to_coordinates(well_id: str) -> WellCoordinates:
+    def _merged_layout_coords() -> dict:
+        """Stored coordinates visible in the current layout.
+        The "wellplate" layout includes both "wellplate" and "vial" sections."""
+        layout_keys = [CoordinateMapper.CURRENT_LAYOUT]
+        if CoordinateMapper.CURRENT_LAYOUT == 'wellplate':
+            layout_keys.append('vial')
+        layout_coords = {}
+        for key in layout_keys:
+            layout_coords.update(CoordinateMapper.LAYOUT_COORDINATES.get(key, {}))
+        return layout_coords
+
+    @staticmethod
+    def well_to_coordinates(well_id: str, layout_coords: Optional[dict] = None) -> WellCoordinates:
         """
         Convert well ID to physical coordinates - supports multiple layout types
 
         Args:
             well_id: Well identifier (e.g., 'A12', 'R1', 'V3', 'LA1', 'SA2')
+            layout_coords: Pre-merged layout coordinates (computed if omitted)
 
         Returns:
             WellCoordinates with x, y, z positions
         """
         # Check stored coordinates first (per-layout mapping from config.json)
-        # "wellplate" layout includes both "wellplate" and "vial" coordinate sections
-        layout_keys = [CoordinateMapper.CURRENT_LAYOUT]
-        if CoordinateMapper.CURRENT_LAYOUT == 'wellplate':
-            layout_keys.append('vial')
-        layout_coords = {}
-        for key in layout_keys:
-            layout_coords.update(CoordinateMapper.LAYOUT_COORDINATES.get(key, {}))
+        if layout_coords is None:
+            layout_coords = CoordinateMapper._merged_layout_coords()
         stored = layout_coords.get(well_id)
         if stored is not None:
             return WellCoordinates(x=stored["x"], y=stored["y"], z=0.0)
@@ -256,6 +263,28 @@ class CoordinateMapper:
 
         raise ValueError(f"Well '{well_id}' not found in config coordinates. Please calibrate this location.")
 
+    @staticmethod
+    def wells_to_coordinates(well_ids) -> dict:
+        """
+        Resolve many wells against a single merge of the layout coordinates
+
+        Args:
+            well_ids: Iterable of well identifiers
+
+        Returns:
+            Dict of well ID -> WellCoordinates. Wells that can't be resolved are left out.
+        """
+        layout_coords = CoordinateMapper._merged_layout_coords()
+        resolved = {}
+        for well_id in well_ids:
+            if well_id in resolved:
+                continue
+            try:
+                resolved[well_id] = CoordinateMapper.well_to_coordinates(well_id, layout_coords)
+            except ValueError:
+                continue
+        return resolved
+
     @staticmethod
     def coordinates_to_steps(coords: WellCoordinates) -> Tuple[int, int, int]:
         """
@@ -306,14 +335,21 @@ class PipettingController:
     Z_MAX_STEPS = 14000
 
     # Position persistence
-    POSITION_FILE = Path(__file__).parent / "pipette_position.json"
+    POSITION_FILE = Path(__file__).parent / "pipette_position.bin"
+    LEGACY_POSITION_FILE = Path(__file__).parent / "pipette_position.json"  # Read-only fallback
+    POSITION_FLUSH_INTERVAL = 1.0  # Seconds between background flushes of a dirty position
+    # Binary position record: magic, x, y, z, pipette_ml, pipette_count, layout_type, well
+    _POSITION_LAYOUT_LEN = 16
+    _POSITION_WELL_LEN = 8
+    _POSITION_RECORD = struct.Struct(f'<4sddddI{_POSITION_LAYOUT_LEN}s{_POSITION_WELL_LEN}s')
+    _POSITION_MAGIC = b'PPOS'
 
     def __init__(self):
         """Initialize the pipetting controller"""
         self.controller_type = settings.get('CONTROLLER_TYPE')
         self.stepper_controller = _create_stepper_controller(self.controller_type)
         self.mapper = CoordinateMapper()
-        self.stop_requested = False
+        self._stop_event = threading.Event()  # Set by stop(); wakes any pending wait
         self.motor_stopped = bool(settings.get('MOTOR_STOP'))  # Persisted motor interlock
         self.log_buffer = []  # Store log messages for UI display
         self.max_logs = 100  # Maximum number of logs to keep
@@ -325,6 +361,8 @@ class PipettingController:
         self.layout_type = "microchip"  # Current layout type: microchip or wellplate
         CoordinateMapper.CURRENT_LAYOUT = self.layout_type
         self.pipette_ml = 0.0  # Current pipette volume in µL
+        self._sequence_plan = None  # well_id -> WellCoordinates while a sequence runs
+        self._current_well_cache = None  # (key, LAYOUT_COORDINATES, well) of last lookup
 
         # Load stored per-layout coordinates so get_current_well() resolves correctly
         cfg = settings.load()
@@ -335,9 +373,8 @@ class PipettingController:
         CoordinateMapper.CURRENT_LAYOUT = self.layout_type
         # Load pipette_ml from saved position file
         try:
-            if self.POSITION_FILE.exists():
-                with open(self.POSITION_FILE, 'r') as f:
-                    saved = json.load(f)
+            saved = self._read_position_file()
+            if saved is not None:
                 self.pipette_ml = saved.get('pipette_ml', 0.0)
         except Exception:
             pass
@@ -352,6 +389,15 @@ class PipettingController:
             self.stepper_controller.get_motor(2).current_position = -y_steps if self.INVERT_Y else y_steps
             self.stepper_controller.get_motor(3).current_position = z_steps
 
+        # Position writes during motion are deferred: callers mark the position
+        # dirty and a daemon thread persists it on the next flush interval.
+        self._pos_dirty = False
+        # Serialises the dirty check and file write between the flusher and synchronous saves
+        self._pos_lock = threading.RLock()
+        self._flush_stop = threading.Event()
+        self._flush_thread = threading.Thread(target=self._position_flush_loop, name="position-flush", daemon=True)
+        self._flush_thread.start()
+
         self.log(f"Pipetting controller initialized at position: {self.get_current_well() or 'Unknown'}")
         self.log(f"Pipette configuration: {self.current_pipette_count} pipette(s)")
 
@@ -499,29 +545,81 @@ class PipettingController:
         """Clear the log buffer"""
         self.log_buffer.clear()
 
+    def _position_flush_loop(self):
+        """Background loop: persist the position whenever it has been marked dirty."""
+        while not self._flush_stop.wait(self.POSITION_FLUSH_INTERVAL):
+            with self._pos_lock:
+                if self._pos_dirty:
+                    self.save_position()
+
     def save_position(self):
-        """Save current position, pipette count, and layout type to file for recovery after interruption"""
-        try:
-            position_data = {
-                "x": self.current_position.x,
-                "y": self.current_position.y,
-                "z": self.current_position.z,
-                "well": self.get_current_well(),
-                "pipette_count": self.current_pipette_count,
-                "layout_type": self.layout_type,
-                "pipette_ml": self.pipette_ml
-            }
-            with open(self.POSITION_FILE, 'w') as f:
-                json.dump(position_data, f, indent=2)
-        except Exception as e:
-            print(f"Warning: Could not save position to file: {e}")
+        """Save current position, pipette count, and layout type to file for recovery after interruption.
+
+        Writes a fixed-size binary record to a temporary file and renames it
+        over POSITION_FILE so a crash mid-write never leaves a torn position
+        file behind. A layout or well name too long for its field is refused
+        rather than truncated, leaving the previous record in place.
+        """
+        with self._pos_lock:
+            self._pos_dirty = False
+            try:
+                layout_type = self.layout_type.encode('ascii')
+                well = (self.get_current_well() or '').encode('ascii')
+                if len(layout_type) > self._POSITION_LAYOUT_LEN:
+                    raise ValueError(f"layout type {self.layout_type!r} is longer than "
+                                     f"{self._POSITION_LAYOUT_LEN} characters")
+                if len(well) > self._POSITION_WELL_LEN:
+                    raise ValueError(f"well {well.decode()!r} is longer than "
+                                     f"{self._POSITION_WELL_LEN} characters")
+                record = self._POSITION_RECORD.pack(
+                    self._POSITION_MAGIC,
+                    self.current_position.x,
+                    self.current_position.y,
+                    self.current_position.z,
+                    self.pipette_ml,
+                    self.current_pipette_count,
+                    layout_type,
+                    well,
+                )
+                tmp_file = self.POSITION_FILE.with_suffix('.tmp')
+                tmp_file.write_bytes(record)
+                os.replace(tmp_file, self.POSITION_FILE)
+            except Exception as e:
+                print(f"Warning: Could not save position to file: {e}")
+
+    def _read_position_file(self) -> Optional[dict]:
+        """
+        Read the binary position record, falling back to the legacy JSON file
+
+        Returns:
+            Dict of saved position fields, or None if neither file is usable.
+            A valid binary record takes precedence over the legacy JSON file,
+            which is never written; an unrecognised one is ignored.
+        """
+        if self.POSITION_FILE.exists():
+            raw = self.POSITION_FILE.read_bytes()
+            if raw[:4] == self._POSITION_MAGIC and len(raw) == self._POSITION_RECORD.size:
+                _, x, y, z, pipette_ml, pipette_count, layout_type, well = self._POSITION_RECORD.unpack(raw)
+                return {
+                    "x": x,
+                    "y": y,
+                    "z": z,
+                    "well": well.rstrip(b'\0').decode('ascii') or None,
+                    "pipette_count": pipette_count,
+                    "layout_type": layout_type.rstrip(b'\0').decode('ascii'),
+                    "pipette_ml": pipette_ml,
+                }
+            print(f"Warning: Ignoring unrecognised position record in {self.POSITION_FILE.name}")
+
+        if not self.LEGACY_POSITION_FILE.exists():
+            return None
+        return json.loads(self.LEGACY_POSITION_FILE.read_text())
 
     def load_position(self) -> tuple[WellCoordinates, int, str]:
         """Load last known position, pipette count, and layout type from file"""
         try:
-            if self.POSITION_FILE.exists():
-                with open(self.POSITION_FILE, 'r') as f:
-                    position_data = json.load(f)
+            position_data = self._read_position_file()
+            if position_data is not None:
                 # Note: can't use self.log here as it's called before __init__ completes
                 print(f"Loaded last position from file: {position_data.get('well', 'Unknown')}")
                 pipette_count = position_data.get('pipette_count', 1)  # Default to 1 if not found
@@ -560,22 +658,27 @@ class PipettingController:
         self.operation_well = well_id
         self.log(f"Moving to well {well_id}...")
 
-        # Reload config so we always use the latest coordinates and step values
-        cfg = settings.load()
-        CoordinateMapper.LAYOUT_COORDINATES = cfg.get("LAYOUT_COORDINATES", {})
-        CoordinateMapper.STEPS_PER_MM_X = cfg.get('STEPS_PER_MM_X', 100)
-        CoordinateMapper.STEPS_PER_MM_Y = cfg.get('STEPS_PER_MM_Y', 100)
-        CoordinateMapper.STEPS_PER_MM_Z = cfg.get('STEPS_PER_MM_Z', 100)
-
         # Get target coordinates
         Z_UP_POSITION = 70.0
-        try:
-            target_coords = self.mapper.well_to_coordinates(well_id)
-        except ValueError:
-            self.log(f"Well '{well_id}' not found in config coordinates. Please calibrate this location.")
-            self.current_operation = "idle"
-            self.operation_well = None
-            return
+        planned = self._sequence_plan.get(well_id) if self._sequence_plan else None
+        if planned is not None:
+            # Resolved up front by execute_sequence — config is already loaded
+            target_coords = WellCoordinates(x=planned.x, y=planned.y, z=0.0)
+        else:
+            # Reload config so we always use the latest coordinates and step values
+            cfg = settings.load()
+            CoordinateMapper.LAYOUT_COORDINATES = cfg.get("LAYOUT_COORDINATES", {})
+            CoordinateMapper.STEPS_PER_MM_X = cfg.get('STEPS_PER_MM_X', 100)
+            CoordinateMapper.STEPS_PER_MM_Y = cfg.get('STEPS_PER_MM_Y', 100)
+            CoordinateMapper.STEPS_PER_MM_Z = cfg.get('STEPS_PER_MM_Z', 100)
+
+            try:
+                target_coords = self.mapper.well_to_coordinates(well_id)
+            except ValueError:
+                self.log(f"Well '{well_id}' not found in config coordinates. Please calibrate this location.")
+                self.current_operation = "idle"
+                self.operation_well = None
+                return
         self.log(f"  Config coordinates for {well_id}: X={target_coords.x:.2f}, Y={target_coords.y:.2f} (layout={CoordinateMapper.CURRENT_LAYOUT})")
         # z_offset is negative for depth (e.g., -40 = go 40mm below travel height)
         # Wells return z=0 as placeholder; actual Z target = travel height + offset
@@ -637,8 +740,8 @@ class PipettingController:
         self.current_operation = "idle"
         self.operation_well = None
 
-        # Save position to file for recovery
-        self.save_position()
+        # Mark position dirty — the background flusher persists it for recovery
+        self._pos_dirty = True
 
     def aspirate(self, volume_ml: float):
         """
@@ -671,7 +774,7 @@ class PipettingController:
         self.log(f"  Aspirating {actual_ml:.3f} µL ({steps} steps)...")
         self._move_motor(4, steps, self._inv(Direction.CLOCKWISE, self.INVERT_PIPETTE), self.PIPETTE_SPEED, check_limits=False)
         self.pipette_ml += actual_ml
-        self.save_position()
+        self._pos_dirty = True
         time.sleep(0.5)  # Allow liquid to settle
         self.current_operation = "idle"
         self.operation_well = None
@@ -706,34 +809,11 @@ class PipettingController:
         self.log(f"  Dispensing {actual_ml:.3f} µL ({steps} steps)...")
         self._move_motor(4, steps, self._inv(Direction.COUNTERCLOCKWISE, self.INVERT_PIPETTE), self.PIPETTE_SPEED, check_limits=False)
         self.pipette_ml = max(0.0, self.pipette_ml - actual_ml)
-        self.save_position()
+        self._pos_dirty = True
         time.sleep(0.5)  # Allow liquid to settle
         self.current_operation = "idle"
         self.operation_well = None
 
-    def rinse(self, rinse_well: str, volume_ml: float):
-        """
-        Rinse the pipette tip
-
-        Args:
-            rinse_well: Well ID containing rinse solution
-            :param volume_ml:
-        """
-        self.log(f"  Rinsing in well {rinse_well}...")
-        steps = int(volume_ml)
-        for i in range(self.RINSE_CYCLES):
-            # Move to rinse well
-            self.move_to_well(rinse_well, -self.PICKUP_DEPTH)
-
-            # Aspirate rinse solution
-            self.aspirate(steps)  # Use half volume for rinsing
-
-            # Dispense
-            self.dispense(steps)
-
-        # Move back up
-        self.move_to_well(rinse_well, 0)
-
     def _z_to(self, target_z: float):
         """Move Z axis to an absolute position in mm"""
         if self.motor_stopped:
@@ -753,7 +833,7 @@ class PipettingController:
         if self.controller_type != 'arduino_uno_q':
             z_motor = self.stepper_controller.get_motor(3)
             z_motor.current_position = int(target_z * self.mapper.STEPS_PER_MM_Z)
-        self.save_position()
+        self._pos_dirty = True
 
     def execute_transfer(self, pickup_well: str, dropoff_well: str,
                          volume_ml: float, rinse_well: Optional[str] = None,
@@ -784,54 +864,46 @@ class PipettingController:
         # 4. Collect
         self.aspirate(volume_ml)
 
-        # 5. Z up
-        self._z_to(Z_UP)
-
-        # 6. Move to dropoff well (X/Y only)
-        self.move_to_well(dropoff_well)
-
-        # 7. Z down
-        self._z_to(0.0)
+        # 5-7. Z up, move to dropoff well (X/Y only), Z down
+        self._relocate_down(pickup_well, dropoff_well, Z_UP)
 
         # 8. Dispense
         self.dispense(volume_ml)
+        last_well = dropoff_well
 
-        # 9. Z up
-        self._z_to(Z_UP)
-
-        # 10-13. Rinse if specified
+        # 9-11. Rinse if specified
         if rinse_well:
-            # 10. Move to rinse well (X/Y only)
-            self.move_to_well(rinse_well)
-
-            # 11. Z down
-            self._z_to(0.0)
-
-            # 11. Rinse cycles
+            self._relocate_down(last_well, rinse_well, Z_UP)
             for i in range(self.RINSE_CYCLES):
                 self.log(f"  Rinse cycle {i + 1}/{self.RINSE_CYCLES}")
                 self.aspirate(volume_ml)
                 self.dispense(volume_ml)
+            last_well = rinse_well
 
-            # 12. Z up
-            self._z_to(Z_UP)
-
-        # 13-16. Wash if specified
+        # 12-14. Wash if specified
         if wash_well:
-            # 13. Move to wash well (X/Y only)
-            self.move_to_well(wash_well)
-
-            # 14. Z down
-            self._z_to(0.0)
-
-            # 15. Wash cycles
+            self._relocate_down(last_well, wash_well, Z_UP)
             for i in range(self.RINSE_CYCLES):
                 self.log(f"  Wash cycle {i + 1}/{self.RINSE_CYCLES}")
                 self.aspirate(volume_ml)
                 self.dispense(volume_ml)
 
-            # 16. Z up
-            self._z_to(Z_UP)
+        # 15. Z up
+        self._z_to(Z_UP)
+
+    def _relocate_down(self, from_well: str, to_well: str, z_up: float):
+        """
+        Raise Z, travel X/Y to to_well and lower Z again
+
+        When to_well is the well the tip is already down in, the raise and
+        lower would cancel out, so the tip simply stays where it is.
+        """
+        if to_well == from_well:
+            self.log(f"  Staying down in {to_well}")
+            return
+        self._z_to(z_up)
+        self.move_to_well(to_well)
+        self._z_to(0.0)
 
     def execute_step_with_cycles(self, step: PipettingStep):
         """
@@ -842,7 +914,7 @@ class PipettingController:
         """
         for cycle in range(step.cycles):
             # Check for stop request during cycles
-            if self.stop_requested:
+            if self._stop_event.is_set():
                 return False
 
             if step.cycles > 1:
@@ -872,7 +944,7 @@ class PipettingController:
             steps: List of PipettingStep objects
         """
         # Reset stop flag at the start
-        self.stop_requested = False
+        self._stop_event.clear()
 
         # Reload config so we always use the latest coordinates and step values
         cfg = settings.load()
@@ -881,6 +953,34 @@ class PipettingController:
         CoordinateMapper.STEPS_PER_MM_Y = cfg.get('STEPS_PER_MM_Y', 100)
         CoordinateMapper.STEPS_PER_MM_Z = cfg.get('STEPS_PER_MM_Z', 100)
 
+        # Resolve every well the sequence visits once, up front
+        self._sequence_plan = self._compile_sequence(steps)
+        try:
+            self._run_sequence(steps)
+        finally:
+            self._sequence_plan = None
+
+    def _compile_sequence(self, steps: list[PipettingStep]) -> dict:
+        """
+        Resolve every well referenced by a sequence to coordinates once
+
+        Args:
+            steps: List of PipettingStep objects
+
+        Returns:
+            Dict of well ID -> WellCoordinates. Wells that can't be resolved
+            are left out so move_to_well reports them as usual.
+        """
+        well_ids = [
+            well_id
+            for step in steps if step.step_type == 'pipette'
+            for well_id in (step.pickup_well, step.dropoff_well, step.rinse_well, step.wash_well)
+            if well_id
+        ]
+        return self.mapper.wells_to_coordinates(well_ids)
+
+    def _run_sequence(self, steps: list[PipettingStep]):
+        """Step loop of execute_sequence, run against the precompiled well plan"""
         self.total_steps = len(steps)
         self.current_step_index = 0
 
@@ -891,12 +991,13 @@ class PipettingController:
         for step_num, step in enumerate(steps, 1):
             self.current_step_index = step_num - 1
             # Check for stop request
-            if self.stop_requested:
+            if self._stop_event.is_set():
                 self.log("=" * 60)
                 self.log("EXECUTION STOPPED BY USER")
                 self.log(f"Completed {step_num - 1} of {len(steps)} steps")
                 self.log("=" * 60)
-                self.stop_requested = False
+                self.save_position()
+                self._stop_event.clear()
                 self.current_step_index = None
                 self.total_steps = None
                 return
@@ -930,7 +1031,7 @@ class PipettingController:
                 self.log(f"Repetition: {step.repetition_quantity} time(s)")
 
                 for rep in range(step.repetition_quantity):
-                    if self.stop_requested:
+                    if self._stop_event.is_set():
                         break
 
                     if step.repetition_quantity > 1:
@@ -953,11 +1054,15 @@ class PipettingController:
                     self.log(
                         f"Repetition: Every {step.repetition_interval}s for {step.repetition_duration}s ({total_reps} times)")
 
-                    start_time = time.time()
+                    # Absolute deadlines on the monotonic clock so overshoot in one
+                    # repetition doesn't push every later repetition off the grid
+                    start_time = time.monotonic()
+                    end_time = start_time + step.repetition_duration
+                    deadline = start_time
                     rep_count = 0
 
-                    while (time.time() - start_time) < step.repetition_duration:
-                        if self.stop_requested:
+                    while time.monotonic() < end_time:
+                        if self._stop_event.is_set():
                             break
 
                         rep_count += 1
@@ -967,15 +1072,12 @@ class PipettingController:
                         if not self.execute_step_with_cycles(step):
                             break
 
-                        # Calculate time until next repetition
-                        elapsed = time.time() - start_time
-                        next_execution_time = rep_count * step.repetition_interval
-                        remaining_time = next_execution_time - elapsed
-
-                        # Only wait if we haven't exceeded the duration and there's time left
-                        if remaining_time > 0 and elapsed < step.repetition_duration:
+                        # Wait until the next slot, but never past the end of the duration
+                        deadline += step.repetition_interval
+                        remaining_time = min(deadline, end_time) - time.monotonic()
+                        if remaining_time > 0:
                             self.log(f"  Waiting {remaining_time:.1f} seconds until next repetition...")
-                            self._interruptible_sleep(min(remaining_time, step.repetition_duration - elapsed))
+                            self._interruptible_sleep(remaining_time)
                 else:
                     self.log("Warning: Time frequency mode selected but interval/duration not specified")
                     # Fall back to single execution
@@ -987,12 +1089,13 @@ class PipettingController:
                 self.execute_step_with_cycles(step)
 
             # Check for stop after step completion
-            if self.stop_requested:
+            if self._stop_event.is_set():
                 self.log("=" * 60)
                 self.log("EXECUTION STOPPED BY USER")
                 self.log(f"Completed {step_num} of {len(steps)} steps")
                 self.log("=" * 60)
-                self.stop_requested = False
+                self.save_position()
+                self._stop_event.clear()
                 self.current_step_index = None
                 self.total_steps = None
                 return
@@ -1009,20 +1112,26 @@ class PipettingController:
         self.log("=" * 60)
         self.home()
 
+    @property
+    def stop_requested(self) -> bool:
+        """True once stop() has been called, until the sequence acknowledges it"""
+        return self._stop_event.is_set()
+
+    @stop_requested.setter
+    def stop_requested(self, value: bool):
+        if value:
+            self._stop_event.set()
+        else:
+            self._stop_event.clear()
+
     def _interruptible_sleep(self, seconds):
-        """Sleep in small increments so stop_requested is checked promptly."""
-        elapsed = 0.0
-        while elapsed < seconds:
-            if self.stop_requested:
-                return
-            chunk = min(0.25, seconds - elapsed)
-            time.sleep(chunk)
-            elapsed += chunk
+        """Sleep for up to *seconds*, returning as soon as stop() is called."""
+        self._stop_event.wait(seconds)
 
     def stop(self):
         """Request to stop the current execution"""
         self.log("Stop requested...")
-        self.stop_requested = True
+        self._stop_event.set()
         self.stepper_controller.stop_all()
 
     def set_motor_stop(self, stopped: bool):
@@ -1086,7 +1195,7 @@ class PipettingController:
 
         motor = self.stepper_controller.get_motor(motor_id)
 
-        if motor.check_min_limit():
+        if motor.check_min_limit(debounce=True):
             self.log(f"{axis_name} axis already at MIN limit")
             motor.reset_position()
             return
@@ -1156,7 +1265,7 @@ class PipettingController:
 
         motor = self.stepper_controller.get_motor(3)
 
-        if motor.check_max_limit():
+        if motor.check_max_limit(debounce=True):
             self.log("Z axis already at MAX limit")
             return
 
@@ -1219,7 +1328,20 @@ class PipettingController:
         Returns:
             Well ID (e.g., 'A1') or None if not at a well
         """
-        return self.mapper.coordinates_to_well(self.current_position)
+        # The reverse lookup scans every stored well and reads config several times
+        # for the washing stations, so reuse the last answer while nothing it depends
+        # on changed; the key takes the washing-station settings from a single read
+        cfg = settings.load()
+        key = (self.current_position.x, self.current_position.y, CoordinateMapper.CURRENT_LAYOUT,
+               cfg.get('WS_POSITION_X'), cfg.get('WS_POSITION_Y'), cfg.get('WS_GAP'))
+        coords = CoordinateMapper.LAYOUT_COORDINATES
+        cached = self._current_well_cache
+        if cached is not None and cached[0] == key and cached[1] is coords:
+            return cached[2]
+
+        well = self.mapper.coordinates_to_well(self.current_position)
+        self._current_well_cache = (key, coords, well)
+        return well
 
     def set_pipette_count(self, count: int):
         """
@@ -1233,7 +1355,7 @@ class PipettingController:
 
         self.current_pipette_count = count
         self.log(f"Pipette configuration changed to: {count} pipette(s)")
-        self.save_position()  # Save the new configuration
+        self._pos_dirty = True  # Flushed by the background position writer
 
     def toggle_z(self, direction: str):
         """
@@ -1367,6 +1489,9 @@ class PipettingController:
 
     def cleanup(self):
         """Clean up resources"""
+        self._flush_stop.set()
+        self._flush_thread.join(timeout=self.POSITION_FLUSH_INTERVAL * 5)
+        self.save_position()
         self.stepper_controller.cleanup()
 
 
@@ -13,11 +13,17 @@ except (ImportError, RuntimeError):
     print("Warning: RPi.GPIO not available. Running in simulation mode.")
     GPIO_AVAILABLE = False
 
+import functools
+import itertools
+import logging
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from typing import List, Tuple, Optional
 
+logger = logging.getLogger(__name__)
+
 
 class Direction(Enum):
     """Motor rotation direction"""
@@ -25,6 +31,80 @@ class Direction(Enum):
     COUNTERCLOCKWISE = 0
 
 
+# Position delta per step, indexed by direction value (CCW=0, CW=1). Callers may
+# pass pipetting_controller's shared IntEnum, so directions are matched by value
+_DIR_SIGN = (-1, 1)
+
+
+# Step-edge waits shorter than this are timed against a deadline instead of one
+# time.sleep(); longer waits just sleep
+SPIN_WAIT_THRESHOLD = 0.0005
+
+
+def _pulse_wait(seconds: float):
+    """
+    Wait between step edges.
+
+    time.sleep() overshoots short waits by the kernel timer slack, which
+    stretches sub-millisecond pulses unevenly. Short waits poll
+    perf_counter_ns() against a deadline instead, yielding the GIL on each
+    pass so axes stepping in other threads keep running. At SPIN_WAIT_THRESHOLD
+    and above the slack is small next to the wait, so it is one plain sleep.
+    """
+    if seconds >= SPIN_WAIT_THRESHOLD:
+        time.sleep(seconds)
+        return
+    end = time.perf_counter_ns() + int(seconds * 1_000_000_000)
+    while time.perf_counter_ns() < end:
+        time.sleep(0)
+
+
+@functools.lru_cache(maxsize=64)
+def _ramp_up(accel_steps: int, delay: float) -> Tuple[float, ...]:
+    """
+    Acceleration half of the trapezoid, shared by every move with the same
+    ramp length and target delay (moves repeat the same few speeds)
+
+    Returns:
+        Tuple of accel_steps delays from the slow start down to the target
+    """
+    start_delay = max(delay * 4, 0.004)
+    return tuple(start_delay - (start_delay - delay) * (i / accel_steps) for i in range(accel_steps))
+
+
+def _degrees_to_steps(millidegrees: int, steps_per_revolution: int) -> int:
+    """
+    Whole steps for an angle given in thousandths of a degree, truncated toward zero
+
+    Integer arithmetic, so step multiples such as 12.6° on a 1.8° motor are not
+    truncated one step short by float rounding.
+    """
+    steps = abs(millidegrees) * steps_per_revolution // 360000
+    return -steps if millidegrees < 0 else steps
+
+
+def _ramp_delays(steps: int, delay: float):
+    """
+    Per-step delays for a trapezoidal move, built once before the pulse loop
+
+    Ramps from a slow start (4x target or 4ms minimum) up to the target delay
+    over 25% of the move (max 200 steps) and back down symmetrically.
+
+    Returns:
+        Iterator yielding one delay per step
+    """
+    if steps <= 0:
+        return iter(())
+    accel_steps = min(steps // 4, 200)
+    if accel_steps == 0:
+        return itertools.repeat(delay, steps)
+
+    ramp_up = _ramp_up(accel_steps, delay)
+    return itertools.chain(ramp_up,
+                           itertools.repeat(delay, steps - 2 * accel_steps),
+                           reversed(ramp_up))
+
+
 class LimitSwitchState(Enum):
     """Limit switch trigger state"""
     NOT_TRIGGERED = 0
@@ -35,8 +115,12 @@ class LimitSwitchState(Enum):
 class StepperMotor:
     """Individual stepper motor controller using driver (STEP/DIR control)"""
 
+    # Minimum STEP high time (DRV8825 1.9µs, A4988 1µs, TB6600 2.5µs) with margin
+    PULSE_WIDTH = 0.000005
+
     def __init__(self, pulse_pin: int, dir_pin: int, name: str = "Motor",
-                 limit_min_pin: Optional[int] = None, limit_max_pin: Optional[int] = None):
+                 limit_min_pin: Optional[int] = None, limit_max_pin: Optional[int] = None,
+                 bounce_time_ms: float = 5, dir_setup_ns: int = 5000):
         """
         Initialize a stepper motor with driver
 
@@ -46,6 +130,9 @@ class StepperMotor:
             name: Descriptive name for the motor
             limit_min_pin: GPIO pin for minimum limit switch (optional)
             limit_max_pin: GPIO pin for maximum limit switch (optional)
+            bounce_time_ms: Re-sample delay confirming a limit switch press (0 disables)
+            dir_setup_ns: DIR-to-STEP setup time after a direction change; the
+                default covers the DRV8825's 650ns with margin
         """
         self.pulse_pin = pulse_pin
         self.dir_pin = dir_pin
@@ -53,8 +140,11 @@ class StepperMotor:
         self.current_position = 0
         self.limit_min_pin = limit_min_pin
         self.limit_max_pin = limit_max_pin
+        self.bounce_time_ms = bounce_time_ms
+        self.dir_setup_time = dir_setup_ns / 1_000_000_000  # seconds, as _pulse_wait takes
         self.stop_requested = False
         self.ignore_limits = False  # When True, interrupt callbacks are ignored
+        self._dir_level = None  # Last level written to the DIR pin (None = unknown)
 
         # Simulation mode: track simulated position and limit triggers
         self.simulated_travel_range = random.randint(8000, 12000)  # Simulated range in steps
@@ -65,11 +155,10 @@ class StepperMotor:
         self.limit_triggered = None  # Will be set by interrupt callback
 
         if GPIO_AVAILABLE:
-            GPIO.setmode(GPIO.BCM)
-            GPIO.setup(self.pulse_pin, GPIO.OUT)
-            GPIO.setup(self.dir_pin, GPIO.OUT)
-            GPIO.output(self.pulse_pin, GPIO.LOW)
-            GPIO.output(self.dir_pin, GPIO.LOW)
+            # Pin numbering is process-wide; only select it for the first motor
+            if GPIO.getmode() != GPIO.BCM:
+                GPIO.setmode(GPIO.BCM)
+            GPIO.setup([self.pulse_pin, self.dir_pin], GPIO.OUT, initial=GPIO.LOW)
 
             # Setup limit switch pins with pull-up resistors and edge detection
             # Assumes normally-open switches that connect to ground when triggered
@@ -88,6 +177,21 @@ class StepperMotor:
                 except RuntimeError:
                     pass  # Event detect already added
 
+    def set_direction(self, direction: Direction):
+        """
+        Drive the DIR pin for the next move
+
+        The write and the driver's setup wait are skipped when the pin already
+        holds this direction, as on repeated approach/back-off moves.
+        """
+        level = direction.value
+        if level == self._dir_level:
+            return
+        if GPIO_AVAILABLE:
+            GPIO.output(self.dir_pin, level)
+            _pulse_wait(self.dir_setup_time)
+        self._dir_level = level
+
     def _limit_min_callback(self, channel):
         """Interrupt callback when MIN limit switch is triggered"""
         if self.ignore_limits:
@@ -107,12 +211,15 @@ class StepperMotor:
         self.limit_triggered = None
         self.stop_requested = False
 
-    def check_limit_switch(self, pin: Optional[int]) -> bool:
+    def check_limit_switch(self, pin: Optional[int], debounce: bool = False) -> bool:
         """
         Check if a limit switch is triggered
 
         Args:
             pin: GPIO pin number for the limit switch
+            debounce: Confirm a LOW read by sampling again after bounce_time_ms,
+                so a contact bouncing on press or release is not reported as a
+                hit. Use it where a hit ends motion.
 
         Returns:
             True if limit switch is triggered (LOW with pull-up)
@@ -120,6 +227,11 @@ class StepperMotor:
         if pin is None:
             return False
         if GPIO_AVAILABLE:
+            if GPIO.input(pin) != GPIO.LOW:
+                return False
+            if not debounce or not self.bounce_time_ms:
+                return True
+            time.sleep(self.bounce_time_ms / 1000)
             return GPIO.input(pin) == GPIO.LOW
 
         # Simulation mode: simulate limit switch based on position
@@ -129,13 +241,13 @@ class StepperMotor:
             return self.simulated_position >= self.simulated_travel_range
         return False
 
-    def check_min_limit(self) -> bool:
+    def check_min_limit(self, debounce: bool = False) -> bool:
         """Check if minimum limit switch is triggered"""
-        return self.check_limit_switch(self.limit_min_pin)
+        return self.check_limit_switch(self.limit_min_pin, debounce)
 
-    def check_max_limit(self) -> bool:
+    def check_max_limit(self, debounce: bool = False) -> bool:
         """Check if maximum limit switch is triggered"""
-        return self.check_limit_switch(self.limit_max_pin)
+        return self.check_limit_switch(self.limit_max_pin, debounce)
 
     def get_limit_state(self) -> LimitSwitchState:
         """
@@ -174,13 +286,12 @@ class StepperMotor:
         if not check_limits:
             self.ignore_limits = True
 
-        # Set direction
+        # Set direction, and bind the per-step pulse write once for the loop
+        self.set_direction(direction)
         if GPIO_AVAILABLE:
-            GPIO.output(self.dir_pin, direction.value)
-
-        # Acceleration ramp parameters
-        start_delay = max(delay * 4, 0.004)  # Start slow (4× target or 4ms minimum)
-        accel_steps = min(steps // 4, 200)  # Ramp over 25% of move, max 200 steps
+            output, high, low = GPIO.output, GPIO.HIGH, GPIO.LOW
+        pulse_pin = self.pulse_pin
+        pulse_width = self.PULSE_WIDTH
 
         # Remember which limits are already pressed at the start
         # so we can move away from them but stop if we hit a NEW limit
@@ -189,10 +300,19 @@ class StepperMotor:
         left_starting_limits = not (started_at_min or started_at_max)
 
         steps_completed = 0
+        sim_time = 0.0
         limit_state = LimitSwitchState.NOT_TRIGGERED
+        delta = _DIR_SIGN[direction.value]
+
+        # Limit pins polled on every step; None when this move ignores that switch.
+        # With check_limits=False both are None, and the started_at/left flags
+        # below already hold the values the else branches assign.
+        min_pin = self.limit_min_pin if check_limits else None
+        max_pin = self.limit_max_pin if check_limits else None
+        read_limit = self.check_limit_switch
 
-        # Generate step pulses
-        for i in range(steps):
+        # Generate step pulses, timed by the precomputed trapezoidal ramp
+        for current_delay in _ramp_delays(steps, delay):
             # Only honour stop_requested once we've left the starting limit,
             # otherwise the limit-switch interrupt blocks us from moving away.
             # When check_limits=False, ignore limit-triggered stops (EMI noise)
@@ -204,49 +324,38 @@ class StepperMotor:
                     self.stop_requested = False
                     self.limit_triggered = None
 
-            # Check BOTH limit switches before stepping
-            if check_limits:
-                if self.limit_min_pin is not None and self.check_min_limit():
-                    if not started_at_min:
-                        limit_state = LimitSwitchState.MIN_TRIGGERED
-                        print(f"{self.name}: MIN limit hit - stopping")
-                        break
-                else:
-                    started_at_min = False  # We left the min limit
-                    left_starting_limits = True
-
-                if self.limit_max_pin is not None and self.check_max_limit():
-                    if not started_at_max:
-                        limit_state = LimitSwitchState.MAX_TRIGGERED
-                        print(f"{self.name}: MAX limit hit - stopping")
-                        break
-                else:
-                    started_at_max = False  # We left the max limit
-                    left_starting_limits = True
-
-            # Compute per-step delay with trapezoidal ramp
-            remaining = steps - i
-            if accel_steps > 0:
-                # Ramp phase: pick the slower of accel-up and decel-down
-                accel_factor = min(i, accel_steps) / accel_steps  # 0→1 during ramp-up
-                decel_factor = min(remaining - 1, accel_steps) / accel_steps  # 1→0 during ramp-down
-                ramp = min(accel_factor, decel_factor)  # 0 at ends, 1 at cruise
-                current_delay = start_delay - (start_delay - delay) * ramp
+            # Check BOTH limit switches before stepping. Raw samples keep the
+            # loop fast; only a new hit pays for the debounced confirmation.
+            if min_pin is not None and read_limit(min_pin):
+                if not started_at_min and read_limit(min_pin, debounce=True):
+                    limit_state = LimitSwitchState.MIN_TRIGGERED
+                    logger.debug("%s: MIN limit hit - stopping", self.name)
+                    break
             else:
-                current_delay = delay
+                started_at_min = False  # We left the min limit
+                left_starting_limits = True
+
+            if max_pin is not None and read_limit(max_pin):
+                if not started_at_max and read_limit(max_pin, debounce=True):
+                    limit_state = LimitSwitchState.MAX_TRIGGERED
+                    logger.debug("%s: MAX limit hit - stopping", self.name)
+                    break
+            else:
+                started_at_max = False  # We left the max limit
+                left_starting_limits = True
 
             if GPIO_AVAILABLE:
-                GPIO.output(self.pulse_pin, GPIO.HIGH)
-                time.sleep(current_delay)
-                GPIO.output(self.pulse_pin, GPIO.LOW)
-                time.sleep(current_delay)
+                # Hold STEP high only for the driver's minimum pulse width and
+                # spend the rest of the step period in a single LOW wait
+                output(pulse_pin, high)
+                _pulse_wait(pulse_width)
+                output(pulse_pin, low)
+                _pulse_wait(max(2 * current_delay - pulse_width, 0.0))
             else:
-                # Simulation mode: faster delay for testing, update simulated position
-                time.sleep(current_delay * 0.01)  # Much faster in simulation mode
-                if direction.value == Direction.CLOCKWISE.value:
-                    self.simulated_position += 1
-                else:
-                    self.simulated_position -= 1
+                # Simulation mode: track position per step for the limit checks,
+                # and pace the whole move with one sleep after the loop
+                self.simulated_position += delta
+                sim_time += current_delay
 
             steps_completed += 1
 
@@ -254,12 +363,14 @@ class StepperMotor:
             if not left_starting_limits:
                 self.stop_requested = False
 
+        if not GPIO_AVAILABLE:
+            time.sleep(sim_time * 0.01)  # Much faster in simulation mode
+
         # Re-enable limit interrupts
         self.ignore_limits = False
 
         # Update position tracking
-        position_delta = steps_completed if direction.value == Direction.CLOCKWISE.value else -steps_completed
-        self.current_position += position_delta
+        self.current_position += delta * steps_completed
 
         return steps_completed, limit_state
 
@@ -297,38 +408,39 @@ class StepperMotor:
         check_for_min = not started_at_min
         check_for_max = not started_at_max
 
-        print(f"{self.name}: move_until_limit {direction.name}, "
-              f"started_min={started_at_min}, started_max={started_at_max}, "
-              f"check_min={check_for_min}, check_max={check_for_max}")
+        logger.debug("%s: move_until_limit %s, started_min=%s, started_max=%s, "
+                     "check_min=%s, check_max=%s", self.name, direction.name,
+                     started_at_min, started_at_max, check_for_min, check_for_max)
 
-        # Set direction
+        # Set direction, and bind the per-step pulse write once for the loop
+        self.set_direction(direction)
         if GPIO_AVAILABLE:
-            GPIO.output(self.dir_pin, direction.value)
-            time.sleep(0.005)
+            output, high, low = GPIO.output, GPIO.HIGH, GPIO.LOW
+        pulse_pin = self.pulse_pin
 
         steps_taken = 0
+        delta = _DIR_SIGN[direction.value]
 
         try:
             while max_steps == 0 or steps_taken < max_steps:
                 # Check for user stop request between batches
                 if self.stop_requested:
-                    print(f"{self.name}: stop requested during move_until_limit")
+                    logger.debug("%s: stop requested during move_until_limit", self.name)
                     return steps_taken, 'none'
 
                 # Move a batch of steps
                 batch = CHECK_INTERVAL if max_steps == 0 else min(CHECK_INTERVAL, max_steps - steps_taken)
-                for _ in range(batch):
-                    if GPIO_AVAILABLE:
-                        GPIO.output(self.pulse_pin, GPIO.HIGH)
-                        time.sleep(actual_delay)
-                        GPIO.output(self.pulse_pin, GPIO.LOW)
-                        time.sleep(actual_delay)
-                    else:
-                        time.sleep(actual_delay * 0.01)
-                        if direction.value == Direction.CLOCKWISE.value:
-                            self.simulated_position += 1
-                        else:
-                            self.simulated_position -= 1
+                if GPIO_AVAILABLE:
+                    for _ in range(batch):
+                        output(pulse_pin, high)
+                        _pulse_wait(actual_delay)
+                        output(pulse_pin, low)
+                        _pulse_wait(actual_delay)
+                else:
+                    # Simulation mode: switches are only read between batches,
+                    # so advance the whole batch at once
+                    time.sleep(actual_delay * 0.01 * batch)
+                    self.simulated_position += delta * batch
 
                 steps_taken += batch
 
@@ -339,19 +451,19 @@ class StepperMotor:
                 if not left_starting_limit:
                     if started_at_min and not self.check_min_limit():
                         left_starting_limit = True
-                        print(f"{self.name}: Left MIN limit at step {steps_taken}")
+                        logger.debug("%s: Left MIN limit at step %d", self.name, steps_taken)
                     elif started_at_max and not self.check_max_limit():  # pragma: no branch
                         left_starting_limit = True
-                        print(f"{self.name}: Left MAX limit at step {steps_taken}")
+                        logger.debug("%s: Left MAX limit at step %d", self.name, steps_taken)
                     continue  # Don't check target limit until we've left the start
 
                 # Only check the target limit(s) — motor is paused so no EMI
-                if check_for_min and self.check_min_limit():
-                    print(f"{self.name}: Hit MIN at step {steps_taken}")
+                if check_for_min and self.check_min_limit(debounce=True):
+                    logger.debug("%s: Hit MIN at step %d", self.name, steps_taken)
                     return steps_taken, 'min'
 
-                if check_for_max and self.check_max_limit():
-                    print(f"{self.name}: Hit MAX at step {steps_taken}")
+                if check_for_max and self.check_max_limit(debounce=True):
+                    logger.debug("%s: Hit MAX at step %d", self.name, steps_taken)
                     return steps_taken, 'max'
 
         finally:
@@ -359,7 +471,7 @@ class StepperMotor:
             self.ignore_limits = False
             self.clear_limit_trigger()
 
-        print(f"Warning: {self.name} max steps reached ({max_steps})")
+        logger.warning("%s max steps reached (%d)", self.name, max_steps)
         return steps_taken, 'none'
 
     def move_until_any_limit(self, direction: Direction, delay: float = 0.001,
@@ -379,18 +491,18 @@ class StepperMotor:
             True if homing successful
         """
         if self.limit_min_pin is None:
-            print(f"Warning: {self.name} has no min limit switch, cannot home")
+            logger.warning("%s has no min limit switch, cannot home", self.name)
             return False
 
-        print(f"Homing {self.name}...")
+        logger.debug("Homing %s...", self.name)
         steps, hit = self.move_until_limit(Direction.COUNTERCLOCKWISE, delay, max_steps)
 
         if hit != 'none':
             self.current_position = 0
-            print(f"  {self.name} homed successfully ({steps} steps, hit {hit})")
+            logger.debug("  %s homed successfully (%d steps, hit %s)", self.name, steps, hit)
             return True
         else:
-            print(f"  {self.name} homing failed")
+            logger.warning("  %s homing failed", self.name)
             return False
 
     def request_stop(self):
@@ -408,7 +520,7 @@ class StepperMotor:
             steps_per_revolution: Steps for 360° rotation (200 for 1.8° stepper, 400 for 0.9°)
             delay: Delay between steps
         """
-        steps = int((degrees / 360.0) * steps_per_revolution)
+        steps = _degrees_to_steps(round(degrees * 1000), steps_per_revolution)
         self.step(direction, steps, delay)
 
     def stop(self):
@@ -416,6 +528,7 @@ class StepperMotor:
         if GPIO_AVAILABLE:
             GPIO.output(self.pulse_pin, GPIO.LOW)
             GPIO.output(self.dir_pin, GPIO.LOW)
+        self._dir_level = None
 
     def get_position(self) -> int:
         """Get current position in steps"""
@@ -467,9 +580,9 @@ class StepperController:
             else:
                 self.motors[motor_id] = StepperMotor(pins[0], pins[1], f"Motor_{motor_id}")
 
-        print(f"Initialized {len(self.motors)} stepper motors")
+        logger.debug("Initialized %d stepper motors", len(self.motors))
         if use_limit_switches:
-            print("  Limit switches enabled")
+            logger.debug("  Limit switches enabled")
 
     def get_motor(self, motor_id: int) -> StepperMotor:
         """
@@ -481,9 +594,10 @@ class StepperController:
         Returns:
             StepperMotor instance
         """
-        if motor_id not in self.motors:
-            raise ValueError(f"Invalid motor_id: {motor_id}. Must be 1-4")
-        return self.motors[motor_id]
+        try:
+            return self.motors[motor_id]
+        except KeyError:
+            raise ValueError(f"Invalid motor_id: {motor_id}. Must be 1-4") from None
 
     def move_motor(self, motor_id: int, steps: int, direction: Direction = Direction.CLOCKWISE,
                    delay: float = 0.001, check_limits: bool = True) -> Tuple[int, LimitSwitchState]:
@@ -522,13 +636,32 @@ class StepperController:
 
     def move_multiple(self, movements: List[Tuple[int, int, Direction, float]]):
         """
-        Execute movements for multiple motors sequentially
+        Execute movements for multiple motors concurrently.
+        Each motor runs its own movements in order on a separate thread, so
+        different motors overlap their step delays.
 
         Args:
             movements: List of (motor_id, steps, direction, delay) tuples
+
+        Raises:
+            Exception: The first error raised by a motor's moves, once all motors stop
         """
+        per_motor = {}
         for motor_id, steps, direction, delay in movements:
-            self.move_motor(motor_id, steps, direction, delay)
+            per_motor.setdefault(self.get_motor(motor_id), []).append((steps, direction, delay))
+
+        with ThreadPoolExecutor(max_workers=max(len(per_motor), 1)) as pool:
+            futures = [pool.submit(self._run_moves, motor, moves)
+                       for motor, moves in per_motor.items()]
+        # All motors have finished; re-raise the first failure to the caller
+        for future in futures:
+            future.result()
+
+    @staticmethod
+    def _run_moves(motor: StepperMotor, moves: List[Tuple[int, Direction, float]]):
+        """Run one motor's share of move_multiple() in order"""
+        for steps, direction, delay in moves:
+            motor.step(direction, steps, delay)
 
     def check_limit_switch(self, motor_id: int, limit_type: str = 'both') -> dict:
         """
@@ -594,7 +727,7 @@ class StepperController:
             max_steps: Maximum steps (safety limit)
         """
         if home_sequence is None:
-            print("Homing all motors...")
+            logger.debug("Homing all motors...")
             if use_limits and self.use_limit_switches:
                 # Home using limit switches
                 for motor_id in self.motors:
@@ -604,13 +737,13 @@ class StepperController:
                     else:
                         # No limit switch, just reset position
                         motor.reset_position()
-                        print(f"  {motor.name} position reset (no limit switch)")
+                        logger.debug("  %s position reset (no limit switch)", motor.name)
             else:
                 # Just reset positions
                 for motor_id in self.motors:
                     motor = self.get_motor(motor_id)
                     motor.reset_position()
-                    print(f"  {motor.name} position reset")
+                    logger.debug("  %s position reset", motor.name)
         else:
             for motor_id, steps, direction in home_sequence:
                 self.move_motor(motor_id, steps, direction, delay)
@@ -621,7 +754,7 @@ class StepperController:
         for motor in self.motors.values():
             motor.request_stop()
             motor.stop()
-        print("All motors stopped")
+        logger.debug("All motors stopped")
 
     def get_all_positions(self) -> dict:
         """Get current positions of all motors"""
@@ -642,7 +775,7 @@ class StepperController:
         self.stop_all()
         if GPIO_AVAILABLE:
             GPIO.cleanup()
-        print("GPIO cleanup complete")
+        logger.debug("GPIO cleanup complete")
 
 
 # Example usage
@@ -672,8 +805,8 @@ if __name__ == "__main__":  # pragma: no cover
         motor3 = controller.get_motor(3)
         motor3.rotate_degrees(90, Direction.CLOCKWISE)
 
-        # Example 5: Sequential movements
-        print("\nExecuting sequential movements...")
+        # Example 5: Concurrent movements (one thread per motor)
+        print("\nExecuting concurrent movements...")
         test_movements = [
             (1, 50, Direction.CLOCKWISE, 0.002),
             (2, 50, Direction.CLOCKWISE, 0.002),
@@ -6,12 +6,15 @@ This script runs on the Arduino UNO Q Linux MPU and communicates with MCU via ar
 Uses MessagePack-RPC protocol for communication with the Bridge library on MCU
 """
 
+import functools
+import itertools
+import logging
 import socket
 import time
 import threading
 import struct
 from enum import IntEnum
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Union
 
 # Try to import msgpack, provide fallback installation instructions
 try:
@@ -20,6 +23,8 @@ except ImportError:
     print("ERROR: msgpack not installed. Run: pip install msgpack")
     raise
 
+logger = logging.getLogger(__name__)
+
 
 class Direction(IntEnum):
     """Motor rotation direction"""
@@ -27,6 +32,55 @@ class Direction(IntEnum):
     CLOCKWISE = 1
 
 
+class LedPattern(IntEnum):
+    """LED test pattern IDs understood by the MCU's led_test RPC"""
+    IDLE = 0
+    SUCCESS = 1
+    ERROR = 2
+    PROGRESS = 3
+    MOTOR0 = 4
+    MOTOR1 = 5
+    MOTOR2 = 6
+    MOTOR3 = 7
+    SWEEP = 8
+    ALL = 9
+    RGB = 10
+
+
+# Pattern names accepted by led_test(); "motor" is handled separately (MOTOR0 + value)
+_LED_PATTERNS = {
+    "idle": LedPattern.IDLE,
+    "success": LedPattern.SUCCESS,
+    "error": LedPattern.ERROR,
+    "progress": LedPattern.PROGRESS,
+    "motor0": LedPattern.MOTOR0,
+    "motor1": LedPattern.MOTOR1,
+    "motor2": LedPattern.MOTOR2,
+    "motor3": LedPattern.MOTOR3,
+    "sweep": LedPattern.SWEEP,
+    "matrix": LedPattern.SWEEP,
+    "all": LedPattern.ALL,
+    "rgb": LedPattern.RGB,
+    "rgb_cycle": LedPattern.RGB,
+}
+
+
+# Request frame prefix: fixarray(4), type=0, then the msgid as a fixed-width uint32
+_REQUEST_HEAD = b"\x94\x00\xce"
+_MSG_ID = struct.Struct(">I")
+
+
+@functools.lru_cache(maxsize=32)
+def _packed_method(method: str) -> bytes:
+    """
+    Packed method name of a request
+
+    The RPC verbs are a small fixed set, so each name is packed once. Params
+    are packed per call so their msgpack types always match the arguments.
+    """
+    return msgpack.packb(method)
+
+
 class StepperController:
     """
     Interface to Arduino UNO Q stepper motor controller
@@ -38,8 +92,19 @@ class StepperController:
     def __init__(self):
         """Initialize connection to MCU via arduino-router"""
         self.sock = None
-        self.msg_id = 0
+        self._timeout = None  # Receive timeout currently set on self.sock
+        self._next_msg_id = itertools.count(1).__next__  # Atomic under the GIL; masked to uint32 per request
         self.lock = threading.Lock()
+        # Streaming decoder kept across calls: bytes past one response stay buffered for the next.
+        # Responses decode to tuples (no list allocations) and are a few bytes, so a 64 KiB cap
+        # on buffered input is generous.
+        self._unpacker = msgpack.Unpacker(raw=False, use_list=False, max_buffer_size=65536)
+        self._rxbuf = bytearray(4096)
+        # Stop requests get their own connection: self.lock is held until the MCU
+        # answers, which for a move or batch is the whole move
+        self._stop_sock = None
+        self._stop_unpacker = None
+        self._stop_lock = threading.Lock()
         self._connect()
         self._init_all_motors()
 
@@ -48,28 +113,80 @@ class StepperController:
         try:
             self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
             self.sock.connect(self.SOCKET_PATH)
-            self.sock.settimeout(10.0)  # 10 second timeout
-            print("Connected to MCU via arduino-router")
-            time.sleep(0.3)  # Wait for bridge to stabilize
+            self._timeout = None  # New socket: force the first settimeout
+            self._set_timeout(10.0)  # 10 second timeout
+            logger.info("Connected to MCU via arduino-router")
+            self._wait_for_bridge()
 
         except Exception as e:
-            print(f"Failed to connect to arduino-router: {e}")
+            logger.error("Failed to connect to arduino-router: %s", e)
             raise
 
+    def _wait_for_bridge(self, max_wait: float = 0.5):
+        """
+        Wait until the bridge answers a ping, instead of a fixed settle delay
+
+        Gives up with a single warning after max_wait seconds; the calls that
+        follow will report any real connection problem.
+        """
+        deadline = time.monotonic() + max_wait
+        # Unanswered probes are expected while the bridge starts, so they are not logged
+        while self._call_rpc("ping", timeout=0.05, log_errors=False) != "pong":
+            if time.monotonic() >= deadline:
+                logger.warning("Bridge did not answer ping within %.1f s", max_wait)
+                break
+            time.sleep(0.01)
+
     def _init_all_motors(self):
-        """Initialize all 4 motors on the MCU"""
-        for motor_id in range(1, 5):
-            if self.init_motor(motor_id):
-                print(f"Motor {motor_id} initialized")
+        """Initialize all 4 motors on the MCU (one pipelined round trip)"""
+        motor_ids = range(1, 5)
+        results = self._call_rpc_batch([("init_motor", (motor_id,)) for motor_id in motor_ids])
+        for motor_id, result in zip(motor_ids, results):
+            if result == 1:
+                logger.info("Motor %d initialized", motor_id)
             else:
-                print(f"Warning: Motor {motor_id} failed to initialize")
+                logger.warning("Motor %d failed to initialize", motor_id)
+
+    def _set_timeout(self, timeout: float):
+        """Set the socket receive timeout, skipping the syscalls when it is unchanged"""
+        if timeout != self._timeout:
+            self.sock.settimeout(timeout)
+            self._timeout = timeout
+
+    def _pack_request(self, method: str, args: tuple) -> Tuple[int, bytes]:
+        """
+        Build a MessagePack-RPC request [type=0, msgid, method, params]
+
+        Returns:
+            Tuple of (msg_id, packed request)
+        """
+        msg_id = self._next_msg_id() & 0xFFFFFFFF
+        return msg_id, _REQUEST_HEAD + _MSG_ID.pack(msg_id) + _packed_method(method) + msgpack.packb(args)
 
-    def _next_msg_id(self) -> int:
-        """Get next message ID"""
-        self.msg_id = (self.msg_id + 1) % 0xFFFFFFFF
-        return self.msg_id
+    def _parse_response(self, response: Any) -> Tuple[Optional[int], Any]:
+        """
+        Validate a MessagePack-RPC response: [type=1, msgid, error, result]
 
-    def _call_rpc(self, method: str, *args, timeout: float = 10.0) -> Any:
+        Returns:
+            Tuple of (msg_id, result); result is None for an invalid or error response
+        """
+        if len(response) != 4:
+            logger.error("Invalid response format: %r", response)
+            return None, None
+
+        resp_type, resp_id, error, result = response
+
+        if resp_type != 1:
+            logger.error("Unexpected response type: %r", resp_type)
+            return resp_id, None
+
+        if error is not None:
+            logger.error("RPC error: %s", error)
+            return resp_id, None
+
+        return resp_id, result
+
+    def _call_rpc(self, method: str, *args, timeout: float = 10.0, log_errors: bool = True) -> Any:
         """
         Call RPC method on MCU
 
@@ -77,79 +194,151 @@ class StepperController:
             method: RPC method name
             *args: Method arguments
             timeout: Response timeout in seconds
+            log_errors: If False, a timeout or transport failure returns None without logging
 
         Returns:
             Method return value or None on error
         """
         with self.lock:
             try:
-                # Build MessagePack-RPC request: [type=0, msgid, method, params]
-                msg_id = self._next_msg_id()
-                request = [0, msg_id, method, list(args)]
-
                 # Pack and send
-                packed = msgpack.packb(request)
+                msg_id, packed = self._pack_request(method, args)
                 self.sock.sendall(packed)
 
-                # Receive response
-                self.sock.settimeout(timeout)
-                response_data = self._recv_msgpack()
+                # Receive response, skipping late replies to earlier calls that timed out
+                self._set_timeout(timeout)
+                while True:
+                    response = self._recv_msgpack()
 
-                if response_data is None:
-                    return None
+                    if response is None:
+                        return None
 
-                # Unpack response: [type=1, msgid, error, result]
-                response = msgpack.unpackb(response_data, raw=False)
+                    resp_id, result = self._parse_response(response)
+                    if resp_id == msg_id or resp_id is None:
+                        return result
 
-                if len(response) != 4:
-                    print(f"Invalid response format: {response}")
-                    return None
+            except socket.timeout:
+                if log_errors:
+                    logger.error("RPC call %r timed out", method)
+                return None
+            except Exception as e:
+                if log_errors:
+                    logger.error("RPC call %r failed: %s", method, e)
+                return None
 
-                resp_type, resp_id, error, result = response
+    def _call_rpc_batch(self, calls: List[Tuple[str, tuple]], timeout: float = 10.0) -> List[Any]:
+        """
+        Call several RPC methods in one round trip
 
-                if resp_type != 1:
-                    print(f"Unexpected response type: {resp_type}")
-                    return None
+        All requests go out in a single send before any response is read, and
+        responses are matched back to their calls by msgid. The MCU still
+        executes them one after another, in order.
 
-                if error is not None:
-                    print(f"RPC error: {error}")
-                    return None
+        Args:
+            calls: List of (method, args) tuples
+            timeout: Timeout for each response in seconds
 
-                return result
+        Returns:
+            List of return values in call order (None where a call failed)
+        """
+        msg_ids = []
+        results = {}
+        with self.lock:
+            try:
+                frames = []
+                for method, args in calls:
+                    msg_id, packed = self._pack_request(method, args)
+                    msg_ids.append(msg_id)
+                    frames.append(packed)
+                self.sock.sendall(b"".join(frames))
+
+                self._set_timeout(timeout)
+                pending = set(msg_ids)
+                while pending:
+                    response = self._recv_msgpack()
+                    if response is None:
+                        break
+                    # Late replies to earlier timed-out calls are not in pending and are dropped
+                    resp_id, result = self._parse_response(response)
+                    if resp_id in pending:
+                        pending.discard(resp_id)
+                        results[resp_id] = result
 
             except socket.timeout:
-                print(f"RPC call '{method}' timed out")
-                return None
+                logger.error("RPC batch of %d calls timed out", len(calls))
+            except Exception as e:
+                logger.error("RPC batch of %d calls failed: %s", len(calls), e)
+
+        return [results.get(msg_id) for msg_id in msg_ids]
+
+    def _call_stop_rpc(self, method: str, *args, timeout: float = 1.0) -> Any:
+        """
+        Call a stop RPC on the dedicated stop connection
+
+        Does not take self.lock, so a stop reaches the router while another
+        thread is blocked waiting for a move to finish. The connection is opened
+        on first use and dropped after any failure.
+
+        Returns:
+            Method return value or None on error
+        """
+        with self._stop_lock:
+            try:
+                if self._stop_sock is None:
+                    self._stop_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    self._stop_sock.settimeout(timeout)
+                    self._stop_sock.connect(self.SOCKET_PATH)
+                    self._stop_unpacker = msgpack.Unpacker(raw=False, use_list=False,
+                                                           max_buffer_size=65536)
+
+                msg_id, packed = self._pack_request(method, args)
+                self._stop_sock.sendall(packed)
+                while True:
+                    for response in self._stop_unpacker:
+                        resp_id, result = self._parse_response(response)
+                        if resp_id == msg_id or resp_id is None:
+                            return result
+                    data = self._stop_sock.recv(4096)
+                    if not data:
+                        raise ConnectionError("connection closed by arduino-router")
+                    self._stop_unpacker.feed(data)
+
             except Exception as e:
-                print(f"RPC call '{method}' failed: {e}")
+                logger.error("RPC call %r failed: %s", method, e)
+                self._close_stop_sock()
                 return None
 
-    def _recv_msgpack(self) -> Optional[bytes]:
-        """Receive a complete MessagePack message"""
+    def _close_stop_sock(self):
+        """Close the stop connection; the next stop request reopens it"""
+        if self._stop_sock is not None:
+            try:
+                self._stop_sock.close()
+            except OSError:
+                pass
+            self._stop_sock = None
+
+    def _recv_msgpack(self) -> Optional[Any]:
+        """
+        Receive the next complete MessagePack message
+
+        Socket reads land in a reusable buffer and are fed to the persistent
+        streaming Unpacker, so each byte is parsed once and nothing past the
+        end of this message is lost.
+
+        Returns:
+            The decoded message, or None if the socket closed or timed out
+        """
         try:
-            # Read data in chunks
-            data = b""
             while True:
-                chunk = self.sock.recv(4096)
-                if not chunk:
-                    return None
-                data += chunk
-
-                # Try to unpack - if successful, we have complete message
                 try:
-                    msgpack.unpackb(data, raw=False)
-                    return data
-                except msgpack.exceptions.ExtraData as e:
-                    # More data than needed — extract only the first message
-                    # to avoid corrupting the stream for the next RPC call
-                    unpacker = msgpack.Unpacker(raw=False)
-                    unpacker.feed(data)
-                    first_msg = next(unpacker)
-                    # Re-pack just the first message
-                    return msgpack.packb(first_msg)
-                except msgpack.exceptions.UnpackValueError:
-                    # Incomplete message, continue reading
-                    continue
+                    return next(self._unpacker)
+                except StopIteration:
+                    pass  # Incomplete message, read more
+
+                n = self.sock.recv_into(self._rxbuf)
+                if not n:
+                    return None
+                self._unpacker.feed(memoryview(self._rxbuf)[:n])
 
         except socket.timeout:
             return None
@@ -192,13 +381,19 @@ class StepperController:
         Returns:
             Dict with steps_executed and limit_triggered
         """
-        # Calculate timeout based on expected move duration
-        move_time = (steps * delay_us * 2) / 1_000_000  # seconds
-        timeout = max(10, move_time + 5)
-
         result = self._call_rpc("move", motor_id, steps, int(direction), delay_us,
-                                1 if respect_limit else 0, timeout=timeout)
+                                1 if respect_limit else 0, timeout=self._move_timeout(steps, delay_us))
+        return self._move_result(result, steps)
 
+    @staticmethod
+    def _move_timeout(steps: int, delay_us: int) -> float:
+        """Response timeout for a move, based on its expected duration"""
+        move_time = (steps * delay_us * 2) / 1_000_000  # seconds
+        return max(10, move_time + 5)
+
+    @staticmethod
+    def _move_result(result: Any, steps: int) -> Dict:
+        """Decode the MCU's "move" return value into steps_executed and limit_triggered"""
         if result is None:
             return {"steps_executed": 0, "limit_triggered": False}
 
@@ -256,11 +451,19 @@ class StepperController:
         Returns:
             Dict with steps_to_home and homed status
         """
-        move_time = (max_steps * delay_us * 2) / 1_000_000
-        timeout = max(30, move_time + 10)
+        result = self._call_rpc("home", motor_id, int(direction), delay_us, max_steps,
+                                timeout=self._home_timeout(delay_us, max_steps))
+        return self._home_result(result)
 
-        result = self._call_rpc("home", motor_id, int(direction), delay_us, max_steps, timeout=timeout)
+    @staticmethod
+    def _home_timeout(delay_us: int, max_steps: int) -> float:
+        """Response timeout for homing one motor, based on its maximum travel"""
+        move_time = (max_steps * delay_us * 2) / 1_000_000
+        return max(30, move_time + 10)
 
+    @staticmethod
+    def _home_result(result: Any) -> Dict:
+        """Decode the MCU's "home" return value into steps_to_home and homed"""
         if result is None:
             return {"steps_to_home": 0, "homed": False}
 
@@ -274,7 +477,7 @@ class StepperController:
     def home_all(self, direction: Direction = Direction.COUNTERCLOCKWISE,
                  delay_us: int = 2000, max_steps: int = 110000) -> Dict:
         """
-        Home all motors sequentially
+        Home all motors sequentially (on the MCU, sent as one pipelined batch)
 
         Args:
             direction: Direction to move toward home
@@ -287,8 +490,11 @@ class StepperController:
         steps_to_home = []
         homed = []
 
-        for motor_id in range(1, 5):
-            result = self.home_motor(motor_id, direction, delay_us, max_steps)
+        direction = int(direction)  # Convert the enum once, not per motor
+        calls = [("home", (motor_id, direction, delay_us, max_steps)) for motor_id in range(1, 5)]
+        # Motors home one after another, so each reply arrives within one motor's timeout
+        for result in self._call_rpc_batch(calls, timeout=self._home_timeout(delay_us, max_steps)):
+            result = self._home_result(result)
             steps_to_home.append(result["steps_to_home"])
             homed.append(result["homed"])
 
@@ -302,18 +508,21 @@ class StepperController:
             List of dicts with motor_id, min/max triggered states, and pins.
             Result bitmask from MCU: bit0=min triggered, bit1=max triggered.
         """
+        motor_ids = range(1, 5)
+        # One pipelined round trip for all four motors
+        results = self._call_rpc_batch([("get_limit", (motor_id,)) for motor_id in motor_ids])
+
         limits = []
-        for motor_id in range(1, 5):
-            config = DEFAULT_MOTOR_CONFIG.get(motor_id, {})
-            result = self._call_rpc("get_limit", motor_id)
+        for motor_id, result in zip(motor_ids, results):
+            limit_min_pin, limit_max_pin = _LIMIT_PINS[motor_id]
             bitmask = result if result is not None and result >= 0 else 0
             limits.append({
                 "motor_id": motor_id,
                 "min_triggered": bool(bitmask & 1),
                 "max_triggered": bool(bitmask & 2),
                 "triggered": bitmask > 0,  # backwards compat: any limit hit
-                "limit_min_pin": config.get("limit_min_pin"),
-                "limit_max_pin": config.get("limit_max_pin"),
+                "limit_min_pin": limit_min_pin,
+                "limit_max_pin": limit_max_pin,
             })
         return limits
 
@@ -327,7 +536,7 @@ class StepperController:
         Returns:
             True if successful
         """
-        result = self._call_rpc("stop", motor_id)
+        result = self._call_stop_rpc("stop", motor_id)
         return result == 1
 
     def stop_all(self) -> bool:
@@ -337,12 +546,12 @@ class StepperController:
         Returns:
             True if successful
         """
-        result = self._call_rpc("stop_all")
+        result = self._call_stop_rpc("stop_all")
         return result == 1
 
     def move_batch(self, movements: List[Dict], respect_limits: bool = True) -> List[Dict]:
         """
-        Move multiple motors (sequentially in RPC version)
+        Move multiple motors (sequentially on the MCU, sent as one pipelined batch)
 
         Args:
             movements: List of movement dicts with motor_id, steps, direction, delay_us
@@ -351,55 +560,56 @@ class StepperController:
         Returns:
             List of results with motor_id, steps_executed, limit_hit
         """
-        results = []
+        calls = []
+        timeout = 10.0
         for movement in movements:
             motor_id = movement.get("motor_id", 1)
             steps = movement.get("steps", 0)
             direction = movement.get("direction", 0)
             delay_us = movement.get("delay_us", 1000)
 
-            result = self.move_motor(motor_id, steps, Direction(direction), delay_us)
+            # Direction values are 0/1 (Direction members compare equal to them)
+            if direction not in (0, 1):
+                raise ValueError(f"Invalid direction {direction!r} for motor {motor_id}")
+
+            calls.append(("move", (motor_id, steps, int(direction), delay_us,
+                                   1 if respect_limits else 0)))
+            timeout = max(timeout, self._move_timeout(steps, delay_us))
+
+        results = []
+        for (_, args), result in zip(calls, self._call_rpc_batch(calls, timeout=timeout)):
+            motor_id, steps = args[0], args[1]
+            moved = self._move_result(result, steps)
             results.append({
                 "motor_id": motor_id,
-                "steps_executed": result["steps_executed"],
-                "limit_hit": result["limit_triggered"]
+                "steps_executed": moved["steps_executed"],
+                "limit_hit": moved["limit_triggered"]
             })
 
         return results
 
-    def led_test(self, pattern: str = "all", value: int = 0) -> bool:
+    def led_test(self, pattern: Union[str, LedPattern] = "all", value: int = 0) -> bool:
         """
         Run LED test pattern on the matrix and RGB LEDs
 
         Args:
-            pattern: Test pattern name (idle, success, error, progress, motor0-3, sweep, all, rgb)
+            pattern: LedPattern, or pattern name (idle, success, error, progress, motor0-3, sweep, all, rgb)
             value: Optional value for pattern
 
         Returns:
             True if successful
         """
-        # Map pattern names to pattern IDs
-        pattern_map = {
-            "idle": 0,
-            "success": 1,
-            "error": 2,
-            "progress": 3,
-            "motor": 4 + value,  # 4-7 for motors 0-3
-            "motor0": 4,
-            "motor1": 5,
-            "motor2": 6,
-            "motor3": 7,
-            "sweep": 8,
-            "matrix": 8,
-            "all": 9,
-            "rgb": 10,
-            "rgb_cycle": 10,
-        }
-
-        pattern_id = pattern_map.get(pattern.lower(), 0)
+        if isinstance(pattern, LedPattern):
+            pattern_id = int(pattern)
+        else:
+            name = pattern.lower()
+            if name == "motor":
+                pattern_id = LedPattern.MOTOR0 + value  # 4-7 for motors 0-3
+            else:
+                pattern_id = int(_LED_PATTERNS.get(name, LedPattern.IDLE))
 
         # Longer timeout for full test or RGB cycle
-        timeout = 15 if pattern_id in [9, 10] else 5
+        timeout = 15 if pattern_id in (LedPattern.ALL, LedPattern.RGB) else 5
 
         result = self._call_rpc("led_test", pattern_id, timeout=timeout)
         return result == 1
@@ -422,12 +632,14 @@ class StepperController:
 
     def cleanup(self):
         """Close connection to arduino-router"""
+        with self._stop_lock:
+            self._close_stop_sock()
         if self.sock:
             try:
                 self.sock.close()
-            except:
+            except OSError:
                 pass
-        print("Disconnected from MCU")
+        logger.info("Disconnected from MCU")
 
 
 # Motor configuration defaults
@@ -438,9 +650,17 @@ DEFAULT_MOTOR_CONFIG = {
     4: {"name": "Pipette", "pulse_pin": 8, "dir_pin": 9, "limit_min_pin": None, "limit_max_pin": None},
 }
 
+# Flat per-motor lookups derived once from DEFAULT_MOTOR_CONFIG
+MOTOR_NAMES = {motor_id: config["name"] for motor_id, config in DEFAULT_MOTOR_CONFIG.items()}
+_LIMIT_PINS = {motor_id: (config["limit_min_pin"], config["limit_max_pin"])
+               for motor_id, config in DEFAULT_MOTOR_CONFIG.items()}
+
 
 def main():
     """Interactive test of stepper controller"""
+    # Show the controller's connection and error messages on the console
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print("=" * 50)
     print("Arduino UNO Q Stepper Controller Test (RPC)")
     print("=" * 50)
@@ -508,7 +728,7 @@ def main():
                     motor_id = limit.get('motor_id', '?')
                     triggered = limit.get('triggered', False)
                     pin = limit.get('pin', '?')
-                    name = DEFAULT_MOTOR_CONFIG.get(motor_id, {}).get('name', f'Motor {motor_id}')
+                    name = MOTOR_NAMES.get(motor_id, f'Motor {motor_id}')
                     status = "TRIGGERED" if triggered else "open"
                     print(f"  {name}: {status} (pin {pin})")
             elif choice == '6':
@@ -535,7 +755,7 @@ def main():
                 print("Homing all motors...")
                 result = controller.home_all(Direction(direction))
                 for i, (steps, homed) in enumerate(zip(result['steps_to_home'], result['homed'])):
-                    name = DEFAULT_MOTOR_CONFIG.get(i + 1, {}).get('name', f'Motor {i + 1}')
+                    name = MOTOR_NAMES.get(i + 1, f'Motor {i + 1}')
                     print(f"  {name}: {steps} steps, {'homed' if homed else 'NOT homed'}")
             elif choice == '9':
                 print("Enter movements (empty line to finish):")
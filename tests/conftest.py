@@ -2,6 +2,7 @@
 import json
 import sys
 import shutil
+import time
 from pathlib import Path
 from unittest.mock import MagicMock
 
@@ -21,11 +22,24 @@ def mock_gpio(monkeypatch):
     return gpio_mock
 
 
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "real_pulse_wait: keep stepper_control._pulse_wait's deadline polling loop")
+
+
+def _sleep_pulse_wait(seconds):
+    """Stand-in for stepper_control._pulse_wait: one time.sleep per wait, so tests can mock it."""
+    time.sleep(seconds)
+
+
 @pytest.fixture(autouse=True)
-def fast_stepper_sleep(monkeypatch):
+def fast_stepper_sleep(request, monkeypatch):
     """Replace time.sleep in stepper_control with a no-op to speed up motor tests."""
     if 'stepper_control' in sys.modules:
         monkeypatch.setattr('stepper_control.time.sleep', lambda _: None)
+        # Route every pulse wait through the (no-op) sleep instead of the deadline loop
+        if request.node.get_closest_marker('real_pulse_wait') is None:
+            monkeypatch.setattr('stepper_control._pulse_wait', _sleep_pulse_wait)
 
 
 @pytest.fixture
@@ -60,7 +74,11 @@ def patch_config_path(monkeypatch, tmp_config):
 
 @pytest.fixture
 def patch_position_path(monkeypatch, tmp_position):
-    """Redirect PipettingController.POSITION_FILE to temp position."""
+    """Redirect PipettingController's position files to temp paths.
+
+    The legacy JSON file is tmp_position; the binary record is written beside it.
+    """
     from pipetting_controller import PipettingController
-    monkeypatch.setattr(PipettingController, 'POSITION_FILE', tmp_position)
+    monkeypatch.setattr(PipettingController, 'LEGACY_POSITION_FILE', tmp_position)
+    monkeypatch.setattr(PipettingController, 'POSITION_FILE', tmp_position.with_suffix('.bin'))
     return tmp_position
@@ -20,17 +20,19 @@ _pin_modes: dict[int, int] = {}
 _event_callbacks: dict[int, list] = {}
 _limit_triggers: dict[int, int] = {}  # pin -> after_n_outputs remaining
 _output_count: int = 0
+_mode = None
 
 
 def reset():
     """Clear all internal state between tests."""
-    global _output_count
+    global _output_count, _mode
     _call_log.clear()
     _pin_states.clear()
     _pin_modes.clear()
     _event_callbacks.clear()
     _limit_triggers.clear()
     _output_count = 0
+    _mode = None
 
 
 # ── Public helpers ──────────────────────────────────────────────────
@@ -54,7 +56,13 @@ def schedule_limit_trigger(pin: int, after_n_outputs: int):
 # ── RPi.GPIO API surface ───────────────────────────────────────────
 
 def setmode(mode):
+    global _mode
     _call_log.append({"function": "setmode", "mode": mode})
+    _mode = mode
+
+
+def getmode():
+    return _mode
 
 
 def setwarnings(flag):
@@ -69,17 +77,21 @@ def setup(pin, mode, pull_up_down=None, initial=None):
         "pull_up_down": pull_up_down,
         "initial": initial,
     })
-    _pin_modes[pin] = mode
-    if initial is not None:
-        _pin_states[pin] = initial
-    elif mode == IN and pull_up_down == PUD_UP:
-        _pin_states[pin] = HIGH
+    # RPi.GPIO accepts a list/tuple of channels for a single setup
+    for p in (pin if isinstance(pin, (list, tuple)) else (pin,)):
+        _pin_modes[p] = mode
+        if initial is not None:
+            _pin_states[p] = initial
+        elif mode == IN and pull_up_down == PUD_UP:
+            _pin_states[p] = HIGH
 
 
 def output(pin, value):
     global _output_count
     _call_log.append({"function": "output", "pin": pin, "value": value})
-    _pin_states[pin] = value
+    # RPi.GPIO accepts a list/tuple of channels for a single write
+    for p in (pin if isinstance(pin, (list, tuple)) else (pin,)):
+        _pin_states[p] = value
     _output_count += 1
 
     # Check every scheduled trigger
@@ -116,4 +128,6 @@ def remove_event_detect(pin):
 
 
 def cleanup():
+    global _mode
     _call_log.append({"function": "cleanup"})
+    _mode = None
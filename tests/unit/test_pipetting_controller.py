@@ -38,6 +38,8 @@ def pc_mod(mock_gpio):
 @pytest.fixture
 def make_controller(pc_mod, patch_config_path, patch_position_path, monkeypatch):
     """Factory that creates a PipettingController with temp config/position files."""
+    created = []
+
     def _make(**overrides):
         # Write overrides into temp config
         import settings
@@ -57,8 +59,14 @@ def make_controller(pc_mod, patch_config_path, patch_position_path, monkeypatch)
         monkeypatch.setattr(pc_mod.PipettingController, 'DROPOFF_DEPTH', cfg.get('DROPOFF_DEPTH', 5.0))
         monkeypatch.setattr(pc_mod.PipettingController, 'SAFE_HEIGHT', cfg.get('SAFE_HEIGHT', 20.0))
         monkeypatch.setattr(pc_mod.PipettingController, 'RINSE_CYCLES', cfg.get('RINSE_CYCLES', 1))
-        return pc_mod.PipettingController()
-    return _make
+        controller = pc_mod.PipettingController()
+        created.append(controller)
+        return controller
+    yield _make
+    # Stop background position flushers before POSITION_FILE is un-patched
+    for controller in created:
+        controller._flush_stop.set()
+        controller._flush_thread.join()
 
 
 @pytest.fixture
@@ -84,7 +92,9 @@ def arduino_ctrl(pc_mod, patch_config_path, patch_position_path):
 
     with patch.object(pc_mod, '_create_stepper_controller', return_value=mock_sc):
         controller = pc_mod.PipettingController()
-    return controller
+    yield controller
+    controller._flush_stop.set()
+    controller._flush_thread.join()
 
 
 # ===================================================================
@@ -525,6 +535,137 @@ class TestSaveLoadPosition:
         ctrl.POSITION_FILE = Path("/nonexistent/dir/pos.json")
         ctrl.save_position()  # Should not raise
 
+    def test_save_is_atomic_rename(self, ctrl):
+        ctrl.save_position()
+        assert ctrl.POSITION_FILE.exists()
+        assert not ctrl.POSITION_FILE.with_suffix('.tmp').exists()
+
+    def test_save_writes_binary_record(self, ctrl, pc_mod, patch_position_path):
+        ctrl.current_position = pc_mod.WellCoordinates(x=50.0, y=30.0, z=10.0)
+        ctrl.pipette_ml = 5.5
+        ctrl.save_position()
+        assert ctrl.POSITION_FILE.suffix == '.bin'
+        raw = ctrl.POSITION_FILE.read_bytes()
+        assert raw[:4] == b'PPOS'
+        assert len(raw) == ctrl._POSITION_RECORD.size == 64
+        data = ctrl._read_position_file()
+        assert data['pipette_ml'] == 5.5
+        assert data['well'] is None
+        assert data['layout_type'] == ctrl.layout_type
+
+    def test_legacy_json_migrates_on_save(self, ctrl, patch_position_path):
+        # tmp_position fixture is the legacy JSON file; no binary record yet
+        assert not ctrl.POSITION_FILE.exists()
+        pos, count, layout = ctrl.load_position()
+        assert (pos.z, count, layout) == (70.0, 3, "microchip")
+        ctrl.save_position()
+        assert ctrl.POSITION_FILE.read_bytes()[:4] == b'PPOS'
+        pos, count, layout = ctrl.load_position()
+        assert (pos.z, count, layout) == (70.0, 3, "microchip")
+        # The legacy file is left readable as JSON for other consumers
+        assert json.loads(patch_position_path.read_text())['pipette_count'] == 3
+
+    def test_binary_record_takes_precedence(self, ctrl, pc_mod, patch_position_path):
+        ctrl.current_position = pc_mod.WellCoordinates(x=1.0, y=2.0, z=3.0)
+        ctrl.save_position()
+        pos, _, _ = ctrl.load_position()
+        assert (pos.x, pos.y, pos.z) == (1.0, 2.0, 3.0)
+
+    def test_bad_record_falls_back_to_legacy(self, ctrl, capsys):
+        ctrl.POSITION_FILE.write_bytes(b'not a record')
+        pos, count, layout = ctrl.load_position()
+        assert (pos.z, count, layout) == (70.0, 3, "microchip")
+        assert "Ignoring unrecognised position record" in capsys.readouterr().out
+
+    def test_load_default_on_bad_record(self, ctrl, patch_position_path):
+        patch_position_path.unlink()
+        ctrl.POSITION_FILE.write_bytes(b'PPOS' + bytes(10))
+        pos, count, layout = ctrl.load_position()
+        assert (pos.x, count, layout) == (0.0, 1, "microchip")
+
+    def test_save_refuses_long_layout(self, ctrl, capsys):
+        ctrl.save_position()
+        before = ctrl.POSITION_FILE.read_bytes()
+        ctrl.layout_type = "x" * 17
+        ctrl.save_position()
+        assert ctrl.POSITION_FILE.read_bytes() == before
+        assert "longer than 16 characters" in capsys.readouterr().out
+
+    def test_save_refuses_long_well(self, ctrl, capsys):
+        ctrl.save_position()
+        before = ctrl.POSITION_FILE.read_bytes()
+        with patch.object(ctrl, 'get_current_well', return_value="W" * 9):
+            ctrl.save_position()
+        assert ctrl.POSITION_FILE.read_bytes() == before
+        assert "longer than 8 characters" in capsys.readouterr().out
+
+    def test_save_accepts_full_width_fields(self, ctrl):
+        ctrl.layout_type = "x" * 16
+        with patch.object(ctrl, 'get_current_well', return_value="W" * 8):
+            ctrl.save_position()
+        data = ctrl._read_position_file()
+        assert (data['layout_type'], data['well']) == ("x" * 16, "W" * 8)
+
+    def test_save_clears_dirty_flag(self, ctrl):
+        ctrl._pos_dirty = True
+        ctrl.save_position()
+        assert ctrl._pos_dirty is False
+
+
+class TestPositionFlush:
+    def test_set_pipette_count_defers_write(self, ctrl, patch_position_path):
+        with patch.object(ctrl, 'save_position') as mock_save:
+            ctrl.set_pipette_count(3)
+        mock_save.assert_not_called()
+        assert ctrl._pos_dirty is True
+
+    def test_flush_loop_writes_dirty_position(self, ctrl, patch_position_path):
+        ctrl._flush_stop.set()
+        ctrl._flush_thread.join()
+        ctrl._flush_stop.clear()
+        ctrl._pos_dirty = True
+        waits = iter([False, False, True])
+        with patch.object(ctrl._flush_stop, 'wait', side_effect=lambda _: next(waits)), \
+             patch.object(ctrl, 'save_position', wraps=ctrl.save_position) as mock_save:
+            ctrl._position_flush_loop()
+        # Only the first wakeup found the position dirty
+        mock_save.assert_called_once()
+
+    def test_concurrent_saves_do_not_collide(self, ctrl, capsys):
+        """Flusher and synchronous saves share one .tmp path; the lock keeps them apart."""
+        import threading
+
+        def save_many():
+            for _ in range(200):
+                ctrl.save_position()
+
+        threads = [threading.Thread(target=save_many) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert "Could not save position" not in capsys.readouterr().out
+        assert ctrl.POSITION_FILE.read_bytes()[:4] == b'PPOS'
+
+    def test_cleanup_joins_flusher_before_final_save(self, ctrl):
+        ctrl.stepper_controller.cleanup = MagicMock()
+        order = []
+        real_thread = ctrl._flush_thread
+        ctrl._flush_thread = MagicMock()
+        ctrl._flush_thread.join.side_effect = lambda timeout: order.append(('join', timeout))
+        with patch.object(ctrl, 'save_position', side_effect=lambda: order.append('save')):
+            ctrl.cleanup()
+        assert order == [('join', ctrl.POSITION_FLUSH_INTERVAL * 5), 'save']
+        ctrl._flush_thread = real_thread  # Fixture teardown joins the real flusher
+
+    def test_cleanup_stops_flusher_and_saves(self, ctrl):
+        ctrl.stepper_controller.cleanup = MagicMock()
+        ctrl._pos_dirty = True
+        ctrl.cleanup()
+        ctrl._flush_thread.join(timeout=5)
+        assert not ctrl._flush_thread.is_alive()
+        assert ctrl._pos_dirty is False
+
 
 class TestLogging:
     def test_log_and_get_logs(self, ctrl):
@@ -1155,20 +1296,6 @@ class TestDispense:
         assert abs(ctrl.pipette_ml - (5.0 - expected_ml)) < 0.001
 
 
-class TestRinse:
-    def test_n_cycles(self, ctrl, pc_mod):
-        pc_mod.CoordinateMapper.LAYOUT_COORDINATES = {
-            "microchip": {"WS2": {"x": 15.0, "y": 45.0}}
-        }
-        pc_mod.CoordinateMapper.CURRENT_LAYOUT = "microchip"
-        ctrl.current_position = pc_mod.WellCoordinates(x=0.0, y=0.0, z=70.0)
-
-        with patch('time.sleep'):
-            ctrl.rinse("WS2", 5.0)
-        # After rinse, should have moved back to rinse well with z_offset=0
-        assert ctrl.current_operation == "idle"
-
-
 class TestExecuteTransfer:
     def _setup_wells(self, pc_mod):
         pc_mod.CoordinateMapper.LAYOUT_COORDINATES = {
@@ -1213,6 +1340,26 @@ class TestExecuteTransfer:
         with patch('time.sleep'):
             ctrl.execute_transfer("A2", "B2", 5.0, wash_well="WS1")
 
+    def test_one_raise_and_lower_per_well_change(self, ctrl, pc_mod):
+        self._setup_wells(pc_mod)
+        ctrl.current_position = pc_mod.WellCoordinates(x=0.0, y=0.0, z=70.0)
+        with patch.object(ctrl, '_z_to', wraps=ctrl._z_to) as z_to, \
+             patch('time.sleep'):
+            ctrl.execute_transfer("A2", "B2", 5.0, rinse_well="WS2", wash_well="WS1")
+        # Down at A2, then up/down at B2, WS2 and WS1, then a final raise
+        assert [c.args[0] for c in z_to.call_args_list] == [0.0] + [70.0, 0.0] * 3 + [70.0]
+
+    def test_same_well_stays_down(self, ctrl, pc_mod):
+        self._setup_wells(pc_mod)
+        ctrl.current_position = pc_mod.WellCoordinates(x=0.0, y=0.0, z=70.0)
+        with patch.object(ctrl, '_z_to', wraps=ctrl._z_to) as z_to, \
+             patch.object(ctrl, 'move_to_well', wraps=ctrl.move_to_well) as move, \
+             patch('time.sleep'):
+            # Rinse and wash in the same station: no Z round-trip between them
+            ctrl.execute_transfer("A2", "B2", 5.0, rinse_well="WS1", wash_well="WS1")
+        assert [c.args[0] for c in z_to.call_args_list] == [0.0] + [70.0, 0.0] * 2 + [70.0]
+        assert [c.args[0] for c in move.call_args_list] == ["A2", "B2", "WS1"]
+
 
 class TestExecuteStepWithCycles:
     def test_returns_true_on_completion(self, ctrl, pc_mod):
@@ -1254,6 +1401,54 @@ class TestExecuteStepWithCycles:
         assert result is True
 
 
+class TestCompileSequence:
+    def test_resolves_each_well_once(self, ctrl, pc_mod):
+        steps = [
+            pc_mod.PipettingStep(pickup_well="A2", dropoff_well="B2", rinse_well="WS2",
+                                 volume_ml=5.0, wait_time=0, wash_well="WS1"),
+            pc_mod.PipettingStep(pickup_well="A2", dropoff_well="B2", rinse_well=None,
+                                 volume_ml=5.0, wait_time=0),
+        ]
+        mapper = pc_mod.CoordinateMapper
+        with patch.object(mapper, 'well_to_coordinates',
+                          wraps=mapper.well_to_coordinates) as mock_w2c, \
+             patch.object(mapper, '_merged_layout_coords',
+                          wraps=mapper._merged_layout_coords) as mock_merge:
+            plan = ctrl._compile_sequence(steps)
+        assert set(plan) == {"A2", "B2", "WS2", "WS1"}
+        assert mock_w2c.call_count == 4
+        # Layout coordinates are merged once for the whole batch
+        assert mock_merge.call_count == 1
+
+    def test_skips_non_pipette_and_unknown_wells(self, ctrl, pc_mod):
+        steps = [
+            pc_mod.PipettingStep(pickup_well="A2", dropoff_well="B2", rinse_well=None,
+                                 volume_ml=0, wait_time=1, step_type='home'),
+            pc_mod.PipettingStep(pickup_well="NOPE", dropoff_well="B2", rinse_well=None,
+                                 volume_ml=5.0, wait_time=0),
+        ]
+        plan = ctrl._compile_sequence(steps)
+        assert set(plan) == {"B2"}
+
+    def test_move_to_well_uses_plan(self, ctrl, pc_mod):
+        ctrl.current_position = pc_mod.WellCoordinates(x=0.0, y=0.0, z=70.0)
+        ctrl._sequence_plan = {"A2": pc_mod.WellCoordinates(x=112.0, y=20.0, z=0.0)}
+        with patch.object(ctrl.mapper, 'well_to_coordinates') as mock_w2c:
+            ctrl.move_to_well("A2")
+        mock_w2c.assert_not_called()
+        assert ctrl.current_position.x == 112.0
+        # The plan entry itself is never mutated by the move
+        assert ctrl._sequence_plan["A2"].z == 0.0
+
+    def test_plan_cleared_after_sequence_error(self, ctrl, pc_mod):
+        step = pc_mod.PipettingStep(pickup_well="A2", dropoff_well="B2", rinse_well=None,
+                                    volume_ml=5.0, wait_time=0)
+        with patch.object(ctrl, 'execute_transfer', side_effect=RuntimeError("boom")):
+            with pytest.raises(RuntimeError):
+                ctrl.execute_sequence([step])
+        assert ctrl._sequence_plan is None
+
+
 class TestExecuteSequence:
     def _make_step(self, pc_mod, **kwargs):
         defaults = {
@@ -1330,13 +1525,13 @@ class TestExecuteSequence:
             repetition_interval=1, repetition_duration=2,
             wait_time=0,
         )
-        # Mock time.time to simulate elapsed time
+        # Mock time.monotonic to simulate elapsed time
         # Calls: start_time, while-check, elapsed, while-check, elapsed, while-check, elapsed, while-check(exit)
         times = iter([0, 0, 0.5, 0.5, 1.5, 1.5, 2.5, 2.5])
         with patch.object(ctrl, 'execute_transfer'), \
              patch.object(ctrl, 'home'), \
              patch.object(ctrl, '_interruptible_sleep'), \
-             patch('pipetting_controller.time.time', side_effect=times):
+             patch('pipetting_controller.time.monotonic', side_effect=times):
             ctrl.execute_sequence([step])
 
     def test_time_frequency_no_interval(self, ctrl, pc_mod):
@@ -1411,7 +1606,7 @@ class TestExecuteSequence:
 
         with patch.object(ctrl, 'execute_step_with_cycles', side_effect=mock_exec_step), \
              patch.object(ctrl, 'home'), \
-             patch('pipetting_controller.time.time', side_effect=times):
+             patch('pipetting_controller.time.monotonic', side_effect=times):
             ctrl.execute_sequence([step])
 
     def test_time_frequency_with_wait(self, ctrl, pc_mod):
@@ -1425,34 +1620,44 @@ class TestExecuteSequence:
         times = iter([0, 0, 0.5, 0.5, 3.0, 3.0, 5.5, 5.5])
         with patch.object(ctrl, 'execute_transfer'), \
              patch.object(ctrl, 'home'), \
-             patch.object(ctrl, '_interruptible_sleep'), \
-             patch('pipetting_controller.time.time', side_effect=times):
+             patch.object(ctrl, '_interruptible_sleep') as mock_sleep, \
+             patch('pipetting_controller.time.monotonic', side_effect=times):
             ctrl.execute_sequence([step])
+        # Waits land on the 2s grid (t=2, t=4) regardless of step overshoot
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1.5, 1.0]
 
 
 class TestInterruptibleSleep:
     def test_completes_normally(self, ctrl):
-        with patch('pipetting_controller.time.sleep') as mock_sleep:
+        with patch.object(ctrl._stop_event, 'wait', return_value=False) as mock_wait:
             ctrl._interruptible_sleep(0.5)
-        assert mock_sleep.call_count >= 1
+        mock_wait.assert_called_once_with(0.5)
 
     def test_stops_early_on_stop_requested(self, ctrl):
         ctrl.stop_requested = True
-        with patch('pipetting_controller.time.sleep') as mock_sleep:
+        with patch.object(ctrl._stop_event, 'wait', wraps=ctrl._stop_event.wait) as mock_wait:
             ctrl._interruptible_sleep(10.0)
-        # Should exit immediately
-        mock_sleep.assert_not_called()
+        # The event is already set, so the real wait returns at once
+        mock_wait.assert_called_once_with(10.0)
+        assert ctrl._stop_event.is_set()
 
     def test_stops_mid_sleep(self, ctrl):
-        call_count = [0]
-        def mock_sleep(secs):
-            call_count[0] += 1
-            if call_count[0] >= 2:
-                ctrl.stop_requested = True
+        def stopped_while_waiting(timeout):
+            ctrl.stop()
+            return ctrl._stop_event.is_set()
 
-        with patch('pipetting_controller.time.sleep', side_effect=mock_sleep):
-            ctrl._interruptible_sleep(2.0)
-        assert call_count[0] >= 2
+        with patch.object(ctrl._stop_event, 'wait', side_effect=stopped_while_waiting) as mock_wait, \
+             patch.object(ctrl.stepper_controller, 'stop_all') as mock_stop_all:
+            ctrl._interruptible_sleep(10.0)
+        mock_wait.assert_called_once_with(10.0)
+        mock_stop_all.assert_called_once()
+        assert ctrl.stop_requested is True
+
+    def test_stop_requested_property_round_trip(self, ctrl):
+        ctrl.stop_requested = True
+        assert ctrl._stop_event.is_set()
+        ctrl.stop_requested = False
+        assert ctrl.stop_requested is False
 
 
 # ===================================================================
@@ -1787,7 +1992,7 @@ class TestTimeFrequencyWaitCalculation:
         with patch.object(ctrl, 'execute_transfer'), \
              patch.object(ctrl, 'home'), \
              patch.object(ctrl, '_interruptible_sleep'), \
-             patch('pipetting_controller.time.time', side_effect=time_iter):
+             patch('pipetting_controller.time.monotonic', side_effect=time_iter):
             ctrl.execute_sequence([step])
 
 
@@ -1942,10 +2147,48 @@ class TestSavePositionWell:
         pc_mod.CoordinateMapper.CURRENT_LAYOUT = "microchip"
         ctrl.current_position = pc_mod.WellCoordinates(x=100.0, y=20.0, z=0.0)
         ctrl.save_position()
-        data = json.loads(patch_position_path.read_text())
+        data = ctrl._read_position_file()
         assert data['well'] == 'A2'
 
 
+class TestGetCurrentWellCache:
+    @pytest.fixture(autouse=True)
+    def _layout(self, ctrl, pc_mod):
+        pc_mod.CoordinateMapper.LAYOUT_COORDINATES = {
+            "microchip": {"A2": {"x": 100.0, "y": 20.0}, "B2": {"x": 100.0, "y": 40.0}}
+        }
+        pc_mod.CoordinateMapper.CURRENT_LAYOUT = "microchip"
+        ctrl.current_position = pc_mod.WellCoordinates(x=100.0, y=20.0, z=0.0)
+
+    def test_repeated_calls_reuse_lookup(self, ctrl, pc_mod):
+        with patch.object(ctrl.mapper, 'coordinates_to_well',
+                          wraps=ctrl.mapper.coordinates_to_well) as mock_c2w:
+            assert ctrl.get_current_well() == "A2"
+            assert ctrl.get_current_well() == "A2"
+        assert mock_c2w.call_count == 1
+
+    def test_position_change_invalidates(self, ctrl, pc_mod):
+        assert ctrl.get_current_well() == "A2"
+        ctrl.current_position.y = 40.0
+        assert ctrl.get_current_well() == "B2"
+
+    def test_layout_coordinates_reload_invalidates(self, ctrl, pc_mod):
+        assert ctrl.get_current_well() == "A2"
+        pc_mod.CoordinateMapper.LAYOUT_COORDINATES = {
+            "microchip": {"C2": {"x": 100.0, "y": 20.0}}
+        }
+        assert ctrl.get_current_well() == "C2"
+
+    def test_washing_station_settings_invalidate(self, ctrl, pc_mod):
+        import settings
+        ctrl.current_position = pc_mod.WellCoordinates(x=50.0, y=13.0, z=0.0)
+        assert ctrl.get_current_well() == "WS1"
+        cfg = settings.load()
+        cfg['WS_POSITION_Y'] = 13.0 - cfg['WS_GAP']
+        settings.save(cfg)
+        assert ctrl.get_current_well() == "WS2"
+
+
 class TestDirection:
     def test_values(self, pc_mod):
         assert pc_mod.Direction.CLOCKWISE == 1
@@ -2062,17 +2305,17 @@ class TestTimeFrequencyStopRequested:
             repetition_duration=60,
         )
 
-        # time.time() calls: 1) start_time=0, 2) while condition check=0 (< 60 → enter loop)
+        # time.monotonic() calls: 1) start_time=0, 2) while condition check=0 (< 60 → enter loop)
         # stop_requested is set True between while-condition and the if-check
         def time_side_effect():
             """Yield time values; set stop_requested after the while condition passes."""
-            yield 0.0   # start_time = time.time()
+            yield 0.0   # start_time = time.monotonic()
             ctrl.stop_requested = True
-            yield 0.0   # while (time.time() - start_time) < duration → True
+            yield 0.0   # while time.monotonic() < end_time → True
 
         gen = time_side_effect()
         with patch.object(ctrl, 'home'), \
-             patch('time.time', side_effect=lambda: next(gen)):
+             patch('time.monotonic', side_effect=lambda: next(gen)):
             ctrl.execute_sequence([step])
         # Stop was triggered inside the time-frequency loop
         # execute_sequence resets stop_requested at line 884 when it detects it,
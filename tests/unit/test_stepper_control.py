@@ -70,6 +70,75 @@ class TestEnums:
         assert sc.LimitSwitchState.MAX_TRIGGERED.value == 2
 
 
+# ===================================================================
+# _pulse_wait
+# ===================================================================
+
+@pytest.mark.real_pulse_wait
+class TestPulseWait:
+    def test_long_wait_sleeps_once(self, sc, monkeypatch):
+        monkeypatch.setattr(sc, 'SPIN_WAIT_THRESHOLD', 0.0005)
+        with patch("time.sleep") as mock_sleep, \
+             patch("time.perf_counter_ns") as mock_clock:
+            sc._pulse_wait(0.001)
+        assert mock_sleep.call_args_list == [((0.001,),)]
+        mock_clock.assert_not_called()
+
+    def test_threshold_wait_sleeps_once(self, sc, monkeypatch):
+        monkeypatch.setattr(sc, 'SPIN_WAIT_THRESHOLD', 0.0005)
+        with patch("time.sleep") as mock_sleep, \
+             patch("time.perf_counter_ns") as mock_clock:
+            sc._pulse_wait(0.0005)
+        assert mock_sleep.call_args_list == [((0.0005,),)]
+        mock_clock.assert_not_called()
+
+    def test_short_wait_polls_deadline(self, sc, monkeypatch):
+        monkeypatch.setattr(sc, 'SPIN_WAIT_THRESHOLD', 0.0005)
+        clock = iter([0, 50_000, 99_999, 100_000])
+        with patch("time.sleep") as mock_sleep, \
+             patch("time.perf_counter_ns", side_effect=lambda: next(clock)):
+            sc._pulse_wait(0.0001)
+        # Two passes before the 100µs deadline, each yielding the GIL
+        assert mock_sleep.call_args_list == [((0,),), ((0,),)]
+
+
+# ===================================================================
+# _ramp_delays
+# ===================================================================
+
+class TestRampDelays:
+    @staticmethod
+    def _reference(steps, delay):
+        """Per-step trapezoid formula the precomputed ramp must reproduce."""
+        start_delay = max(delay * 4, 0.004)
+        accel_steps = min(steps // 4, 200)
+        out = []
+        for i in range(steps):
+            if accel_steps > 0:
+                accel_factor = min(i, accel_steps) / accel_steps
+                decel_factor = min(steps - i - 1, accel_steps) / accel_steps
+                ramp = min(accel_factor, decel_factor)
+                out.append(start_delay - (start_delay - delay) * ramp)
+            else:
+                out.append(delay)
+        return out
+
+    @pytest.mark.parametrize("steps", [0, 1, 3, 4, 7, 100, 801, 2000])
+    def test_matches_per_step_formula(self, sc, steps):
+        assert list(sc._ramp_delays(steps, 0.001)) == self._reference(steps, 0.001)
+
+    @pytest.mark.parametrize("steps", [-1, -5, -1000])
+    def test_negative_steps_empty_schedule(self, sc, steps):
+        assert list(sc._ramp_delays(steps, 0.001)) == []
+
+    def test_ramp_table_reused_across_moves(self, sc):
+        sc._ramp_up.cache_clear()
+        list(sc._ramp_delays(1000, 0.0007))
+        list(sc._ramp_delays(1200, 0.0007))
+        info = sc._ramp_up.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+
+
 # ===================================================================
 # StepperMotor — construction
 # ===================================================================
@@ -94,13 +163,20 @@ class TestStepperMotorConstruction:
         funcs = [c["function"] for c in log]
         assert "setmode" in funcs
         setup_calls = [c for c in log if c["function"] == "setup"]
-        assert len(setup_calls) == 4  # pulse, dir, limit_min, limit_max
+        assert len(setup_calls) == 3  # [pulse, dir], limit_min, limit_max
         event_calls = [c for c in log if c["function"] == "add_event_detect"]
         assert len(event_calls) == 2
-        # Verify output calls set pins LOW
-        output_calls = [c for c in log if c["function"] == "output"]
-        assert {"function": "output", "pin": 4, "value": 0} in output_calls
-        assert {"function": "output", "pin": 17, "value": 0} in output_calls
+        # Pulse and dir are configured together and start LOW
+        assert setup_calls[0]["pin"] == [4, 17]
+        assert setup_calls[0]["initial"] == mock_gpio.LOW
+        assert mock_gpio._pin_states[4] == mock_gpio.LOW
+        assert mock_gpio._pin_states[17] == mock_gpio.LOW
+
+    def test_setmode_only_once(self, sc, mock_gpio):
+        mock_gpio.reset()
+        sc.StepperController()
+        setmode_calls = [c for c in mock_gpio.get_call_log() if c["function"] == "setmode"]
+        assert len(setmode_calls) == 1
 
     def test_no_limit_pins(self, sc, mock_gpio):
         mock_gpio.reset()
@@ -153,6 +229,17 @@ class TestStepperMotorStep:
         assert limit == sc.LimitSwitchState.NOT_TRIGGERED
         assert motor.current_position == -10
 
+    @pytest.mark.parametrize("steps", [0, -1, -10])
+    @patch("time.sleep")
+    def test_non_positive_steps_do_not_move(self, mock_sleep, motor, sc, mock_gpio, steps):
+        steps_done, limit = motor.step(sc.Direction.CLOCKWISE, steps=steps, delay=0.001)
+        assert steps_done == 0
+        assert limit == sc.LimitSwitchState.NOT_TRIGGERED
+        assert motor.current_position == 0
+        pulses = [c for c in mock_gpio.get_call_log()
+                  if c["function"] == "output" and c["pin"] == motor.pulse_pin]
+        assert pulses == []
+
     @patch("time.sleep")
     def test_position_tracking_multiple_moves(self, mock_sleep, motor, sc, mock_gpio):
         motor.step(sc.Direction.CLOCKWISE, steps=100, delay=0.001)
@@ -176,7 +263,8 @@ class TestStepperMotorStep:
     def test_trapezoidal_acceleration_ramp(self, mock_sleep, motor, sc, mock_gpio):
         """Verify delay decreases (ramp-up) then increases (ramp-down)."""
         motor.step(sc.Direction.CLOCKWISE, steps=100, delay=0.001)
-        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        # Skip the DIR setup wait, then take the LOW legs
+        delays = [call.args[0] for call in mock_sleep.call_args_list][1:][1::2]
         first = delays[0]
         mid = delays[len(delays) // 2]
         last = delays[-2]
@@ -188,7 +276,14 @@ class TestStepperMotorStep:
         """steps < 4 → accel_steps = 0 → constant delay."""
         motor.step(sc.Direction.CLOCKWISE, steps=3, delay=0.002)
         delays = [call.args[0] for call in mock_sleep.call_args_list]
-        assert all(d == 0.002 for d in delays)
+        width = motor.PULSE_WIDTH
+        assert delays == [motor.dir_setup_time] + [width, 0.004 - width] * 3
+
+    @patch("time.sleep")
+    def test_delay_shorter_than_pulse_width(self, mock_sleep, motor, sc, mock_gpio):
+        """The LOW leg never goes negative when the period is under the pulse width."""
+        motor.step(sc.Direction.CLOCKWISE, steps=1, delay=0.000001)
+        assert mock_sleep.call_args_list[-1].args[0] == 0.0
 
     @patch("time.sleep")
     def test_check_limits_stops_on_min(self, mock_sleep, motor, sc, mock_gpio):
@@ -403,6 +498,20 @@ class TestMoveUntilLimit:
         assert which == 'max'
         assert steps_taken > 0
 
+    @patch("time.sleep")
+    def test_bouncing_limit_does_not_end_move(self, mock_sleep, motor, sc, mock_gpio):
+        """A LOW that clears by the debounce re-sample is not a hit."""
+        def sleep_side_effect(t):
+            if t == 0.001:  # EMI settle pause: contact bounces closed
+                mock_gpio.set_pin_state(26, mock_gpio.LOW)
+            elif t == motor.bounce_time_ms / 1000:  # ...and open again
+                mock_gpio.set_pin_state(26, mock_gpio.HIGH)
+
+        mock_sleep.side_effect = sleep_side_effect
+        steps_taken, which = motor.move_until_limit(sc.Direction.COUNTERCLOCKWISE, delay=0.001, max_steps=100)
+        assert which == 'none'
+        assert steps_taken == 100
+
     @patch("time.sleep")
     def test_max_steps_safety_cutoff(self, mock_sleep, motor, sc, mock_gpio):
         steps_taken, which = motor.move_until_limit(sc.Direction.CLOCKWISE, delay=0.001, max_steps=100)
@@ -419,7 +528,7 @@ class TestMoveUntilLimit:
     def test_emi_settle_pause(self, mock_sleep, motor, sc, mock_gpio):
         motor.move_until_limit(sc.Direction.CLOCKWISE, delay=0.001, max_steps=50)
         sleep_args = [call.args[0] for call in mock_sleep.call_args_list]
-        assert 0.005 in sleep_args  # direction setup sleep
+        assert motor.dir_setup_time in sleep_args  # direction setup wait
         assert 0.001 in sleep_args  # EMI settle sleep
 
     @patch("time.sleep")
@@ -427,7 +536,7 @@ class TestMoveUntilLimit:
         motor.move_until_limit(sc.Direction.CLOCKWISE, delay=0.00001,
                                max_steps=50, override_min_delay=True)
         sleep_args = [call.args[0] for call in mock_sleep.call_args_list]
-        step_delays = [d for d in sleep_args if d not in (0.005, 0.001)]
+        step_delays = [d for d in sleep_args if d not in (motor.dir_setup_time, 0.001)]
         assert all(d == 0.00001 for d in step_delays)
 
     @patch("time.sleep")
@@ -435,7 +544,7 @@ class TestMoveUntilLimit:
         motor.move_until_limit(sc.Direction.CLOCKWISE, delay=0.00001,
                                max_steps=50, override_min_delay=False)
         sleep_args = [call.args[0] for call in mock_sleep.call_args_list]
-        step_delays = [d for d in sleep_args if d not in (0.005, 0.001)]
+        step_delays = [d for d in sleep_args if d not in (motor.dir_setup_time, 0.001)]
         assert all(d == 0.0001 for d in step_delays)
 
     @patch("time.sleep")
@@ -569,6 +678,14 @@ class TestHome:
         assert result is False
         assert motor.current_position == 500  # not reset
 
+    @patch("time.sleep")
+    def test_failure_goes_to_warning_log(self, mock_sleep, motor, sc, caplog, capsys):
+        with caplog.at_level("WARNING", logger="stepper_control"):
+            motor.home(delay=0.001, max_steps=50)
+        assert "max steps reached (50)" in caplog.text
+        assert "homing failed" in caplog.text
+        assert capsys.readouterr().out == ""
+
 
 # ===================================================================
 # StepperMotor — check_limit_switch / check_min / check_max
@@ -598,6 +715,42 @@ class TestCheckLimitSwitch:
         mock_gpio.set_pin_state(21, mock_gpio.HIGH)
         assert motor.check_max_limit() is False
 
+    def test_bounce_is_not_a_hit(self, motor, sc, mock_gpio, monkeypatch):
+        """A LOW that has cleared by the re-sample is contact bounce."""
+        waits = []
+
+        def settle(t):
+            waits.append(t)
+            mock_gpio.set_pin_state(26, mock_gpio.HIGH)
+
+        monkeypatch.setattr(sc.time, "sleep", settle)
+        mock_gpio.set_pin_state(26, mock_gpio.LOW)
+        assert motor.check_limit_switch(26, debounce=True) is False
+        assert waits == [0.005]
+
+    def test_raw_read_by_default(self, motor, sc, mock_gpio, monkeypatch):
+        monkeypatch.setattr(sc.time, "sleep", lambda t: pytest.fail("slept"))
+        mock_gpio.set_pin_state(26, mock_gpio.LOW)
+        assert motor.check_limit_switch(26) is True
+        assert motor.check_min_limit() is True
+        motor.bounce_time_ms = 0
+        assert motor.check_limit_switch(26, debounce=True) is True
+
+    def test_step_ignores_bounce(self, motor, sc, mock_gpio, monkeypatch):
+        """A single bouncing sample of a new limit does not end the move."""
+        reads = iter([mock_gpio.LOW, mock_gpio.LOW, mock_gpio.HIGH])
+        real_input = mock_gpio.input
+
+        def bouncy_input(pin):
+            if pin == 26 and mock_gpio._output_count > 3:
+                return next(reads, mock_gpio.HIGH)
+            return real_input(pin)
+
+        monkeypatch.setattr(mock_gpio, "input", bouncy_input)
+        steps, state = motor.step(sc.Direction.COUNTERCLOCKWISE, steps=5, delay=0.001)
+        assert steps == 5
+        assert state == sc.LimitSwitchState.NOT_TRIGGERED
+
 
 # ===================================================================
 # StepperMotor — get_limit_state()
@@ -621,6 +774,52 @@ class TestGetLimitState:
         assert motor.get_limit_state() == sc.LimitSwitchState.MIN_TRIGGERED
 
 
+# ===================================================================
+# StepperMotor — set_direction()
+# ===================================================================
+
+class TestSetDirection:
+    @staticmethod
+    def _dir_writes(mock_gpio):
+        return [c for c in mock_gpio.get_call_log()
+                if c["function"] == "output" and c["pin"] == 17]
+
+    def test_writes_and_waits_on_change(self, motor, sc, mock_gpio):
+        with patch("time.sleep") as mock_sleep:
+            motor.set_direction(sc.Direction.CLOCKWISE)
+        assert self._dir_writes(mock_gpio) == [{"function": "output", "pin": 17, "value": 1}]
+        mock_sleep.assert_called_once_with(motor.dir_setup_time)
+
+    def test_default_setup_time(self, motor):
+        assert motor.dir_setup_time == 0.000005
+
+    def test_configured_setup_time(self, sc, mock_gpio):
+        motor = sc.StepperMotor(4, 17, dir_setup_ns=2500)
+        with patch("time.sleep") as mock_sleep:
+            motor.set_direction(sc.Direction.CLOCKWISE)
+        mock_sleep.assert_called_once_with(0.0000025)
+
+    def test_same_direction_skips_write(self, motor, sc, mock_gpio):
+        motor.set_direction(sc.Direction.CLOCKWISE)
+        with patch("time.sleep") as mock_sleep:
+            motor.set_direction(sc.Direction.CLOCKWISE)
+        assert len(self._dir_writes(mock_gpio)) == 1
+        mock_sleep.assert_not_called()
+
+    def test_repeated_moves_write_dir_once(self, motor, sc, mock_gpio):
+        motor.step(sc.Direction.COUNTERCLOCKWISE, steps=2, delay=0.001)
+        motor.step(sc.Direction.COUNTERCLOCKWISE, steps=2, delay=0.001)
+        assert len(self._dir_writes(mock_gpio)) == 1
+        motor.step(sc.Direction.CLOCKWISE, steps=2, delay=0.001)
+        assert len(self._dir_writes(mock_gpio)) == 2
+
+    def test_stop_forgets_level(self, motor, sc, mock_gpio):
+        motor.set_direction(sc.Direction.CLOCKWISE)
+        motor.stop()  # drives DIR low
+        motor.set_direction(sc.Direction.CLOCKWISE)
+        assert [c["value"] for c in self._dir_writes(mock_gpio)] == [1, 0, 1]
+
+
 # ===================================================================
 # StepperMotor — callbacks, flag management, stop
 # ===================================================================
@@ -687,6 +886,25 @@ class TestRotateDegrees:
         motor.rotate_degrees(360, sc.Direction.CLOCKWISE, steps_per_revolution=200, delay=0.001)
         assert motor.current_position == 200
 
+    @patch("time.sleep")
+    def test_step_multiple_angle_is_exact(self, mock_sleep, motor, sc, mock_gpio):
+        # 12.6° is exactly 7 steps of 1.8°; float math truncated it to 6
+        motor.rotate_degrees(12.6, sc.Direction.CLOCKWISE, steps_per_revolution=200, delay=0.001)
+        assert motor.current_position == 7
+
+    def test_partial_step_rounds_down(self, sc):
+        assert sc._degrees_to_steps(900, 200) == 0
+        assert sc._degrees_to_steps(90000, 400) == 100
+
+    def test_negative_partial_step_truncates_toward_zero(self, sc):
+        assert sc._degrees_to_steps(-500, 200) == 0
+        assert sc._degrees_to_steps(-12600, 200) == -7
+
+    @patch("time.sleep")
+    def test_negative_partial_step_does_not_move(self, mock_sleep, motor, sc, mock_gpio):
+        motor.rotate_degrees(-0.5, sc.Direction.CLOCKWISE, steps_per_revolution=200, delay=0.001)
+        assert motor.current_position == 0
+
 
 # ===================================================================
 # StepperMotor — position management
@@ -787,7 +1005,7 @@ class TestControllerMoveMotorUntilLimit:
 
 class TestControllerMoveMultiple:
     @patch("time.sleep")
-    def test_executes_sequentially(self, mock_sleep, sc, mock_gpio):
+    def test_moves_each_motor(self, mock_sleep, sc, mock_gpio):
         ctrl = sc.StepperController()
         movements = [
             (1, 10, sc.Direction.CLOCKWISE, 0.001),
@@ -797,6 +1015,73 @@ class TestControllerMoveMultiple:
         assert ctrl.get_motor(1).current_position == 10
         assert ctrl.get_motor(2).current_position == -20
 
+    @patch("time.sleep")
+    def test_same_motor_moves_run_in_order(self, mock_sleep, sc, mock_gpio):
+        ctrl = sc.StepperController()
+        order = []
+        motor = ctrl.get_motor(1)
+        original = motor.step
+
+        def recording_step(direction, steps, delay):
+            order.append(steps)
+            return original(direction, steps, delay)
+
+        motor.step = recording_step
+        ctrl.move_multiple([
+            (1, 10, sc.Direction.CLOCKWISE, 0.001),
+            (2, 5, sc.Direction.CLOCKWISE, 0.001),
+            (1, 3, sc.Direction.COUNTERCLOCKWISE, 0.001),
+        ])
+        assert order == [10, 3]
+        assert motor.current_position == 7
+
+    @patch("time.sleep")
+    def test_worker_error_reaches_caller(self, mock_sleep, sc, mock_gpio):
+        ctrl = sc.StepperController()
+
+        def failing_step(direction, steps, delay):
+            raise RuntimeError("driver fault")
+
+        ctrl.get_motor(2).step = failing_step
+        with pytest.raises(RuntimeError, match="driver fault"):
+            ctrl.move_multiple([
+                (1, 10, sc.Direction.CLOCKWISE, 0.001),
+                (2, 5, sc.Direction.CLOCKWISE, 0.001),
+            ])
+        # The healthy motor still ran to completion before the error surfaced
+        assert ctrl.get_motor(1).current_position == 10
+
+    @patch("time.sleep")
+    def test_empty_movements(self, mock_sleep, sc, mock_gpio):
+        ctrl = sc.StepperController()
+        ctrl.move_multiple([])
+        assert ctrl.get_motor(1).current_position == 0
+
+    def test_invalid_motor_raises_before_moving(self, sc, mock_gpio):
+        ctrl = sc.StepperController()
+        with pytest.raises(ValueError):
+            ctrl.move_multiple([
+                (1, 10, sc.Direction.CLOCKWISE, 0.001),
+                (9, 10, sc.Direction.CLOCKWISE, 0.001),
+            ])
+        assert ctrl.get_motor(1).current_position == 0
+
+    def test_accepts_shared_int_direction(self, sc, mock_gpio):
+        """pipetting_controller passes its own IntEnum; directions match by value."""
+        from enum import IntEnum
+
+        class SharedDirection(IntEnum):
+            COUNTERCLOCKWISE = 0
+            CLOCKWISE = 1
+
+        ctrl = sc.StepperController()
+        ctrl.move_multiple([
+            (1, 5, SharedDirection.CLOCKWISE, 0.001),
+            (2, 3, SharedDirection.COUNTERCLOCKWISE, 0.001),
+        ])
+        assert ctrl.get_motor(1).current_position == 5
+        assert ctrl.get_motor(2).current_position == -3
+
 
 # ===================================================================
 # StepperController — check_limit_switch
@@ -941,6 +1226,13 @@ class TestControllerHomeAll:
         ctrl.home_all(use_limits=True, delay=0.001)
         assert ctrl.get_motor(1).current_position == 0
 
+    def test_progress_goes_to_debug_log(self, sc, mock_gpio, caplog, capsys):
+        ctrl = sc.StepperController(use_limit_switches=False)
+        with caplog.at_level("DEBUG", logger="stepper_control"):
+            ctrl.home_all(use_limits=False)
+        assert "Motor_1 position reset" in caplog.text
+        assert capsys.readouterr().out == ""
+
 
 # ===================================================================
 # StepperController — stop_all
@@ -1015,12 +1307,23 @@ class TestSimulationMode:
 
     @patch("time.sleep")
     def test_step_simulation_delay_is_reduced(self, mock_sleep, sc, mock_gpio, monkeypatch):
-        """In sim mode, sleep is called with current_delay * 0.01."""
+        """In sim mode, one sleep of the summed step delays * 0.01 paces the move."""
         monkeypatch.setattr(sc, 'GPIO_AVAILABLE', False)
         m = sc.StepperMotor(4, 17, "Sim")
         m.step(sc.Direction.CLOCKWISE, steps=3, delay=0.002, check_limits=False)
-        for call in mock_sleep.call_args_list:
-            assert call.args[0] == pytest.approx(0.00002)
+        assert len(mock_sleep.call_args_list) == 1
+        assert mock_sleep.call_args.args[0] == pytest.approx(0.00006)
+
+    @patch("time.sleep")
+    def test_move_until_limit_simulation_sleeps_per_batch(self, mock_sleep, sc, mock_gpio, monkeypatch):
+        monkeypatch.setattr(sc, 'GPIO_AVAILABLE', False)
+        m = sc.StepperMotor(4, 17, "Sim", limit_min_pin=26, limit_max_pin=21)
+        m.simulated_position = 1000
+        m.move_until_limit(sc.Direction.CLOCKWISE, delay=0.001, max_steps=120)
+        assert m.simulated_position == 1120
+        # One pacing sleep and one EMI-settle sleep per batch of up to 50 steps
+        paced = [c.args[0] for c in mock_sleep.call_args_list if c.args[0] != 0.001]
+        assert paced == pytest.approx([0.0005, 0.0005, 0.0002])
 
     @patch("time.sleep")
     def test_check_limit_switch_simulation_min(self, mock_sleep, sc, mock_gpio, monkeypatch):
@@ -1137,8 +1440,8 @@ class TestMoveUntilLimitStopRequested:
         call_count = [0]
         def set_stop_on_batch(*args, **kwargs):
             call_count[0] += 1
-            # After first batch of 50 steps + EMI settle sleep -> set stop
-            if call_count[0] > 50:
+            # First batch's pacing sleep + EMI settle sleep -> set stop
+            if call_count[0] >= 2:
                 m.stop_requested = True
         mock_sleep.side_effect = set_stop_on_batch
         steps_taken, which = m.move_until_limit(sc.Direction.CLOCKWISE, delay=0.001, max_steps=10000)
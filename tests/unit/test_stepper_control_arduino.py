@@ -0,0 +1,305 @@
+"""Tests for stepper_control_arduino.py RPC transport, against a fake arduino-router."""
+import itertools
+import socket
+import tempfile
+import threading
+from pathlib import Path
+
+import msgpack
+import pytest
+
+import stepper_control_arduino as sca
+
+
+# ---------------------------------------------------------------------------
+# Helpers / Fixtures
+# ---------------------------------------------------------------------------
+
+def _reply(msg_id, result=None, error=None, resp_type=1):
+    """Pack a MessagePack-RPC response as arduino-router sends it."""
+    return msgpack.packb([resp_type, msg_id, error, result])
+
+
+def _read_requests(sock, count):
+    """Read `count` requests from the controller side of the connection."""
+    unpacker = msgpack.Unpacker(raw=False)
+    requests = []
+    while len(requests) < count:
+        unpacker.feed(sock.recv(4096))
+        requests.extend(unpacker)
+    return requests
+
+
+class _FailingSocket:
+    """Socket whose sends raise `error`."""
+
+    def __init__(self, error):
+        self.error = error
+
+    def sendall(self, data):
+        raise self.error
+
+    def close(self):
+        pass
+
+
+class _TimeoutRecorder:
+    """Wrap a socket and record each settimeout() call."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.timeouts = []
+
+    def settimeout(self, timeout):
+        self.timeouts.append(timeout)
+        self.sock.settimeout(timeout)
+
+    def __getattr__(self, name):
+        return getattr(self.sock, name)
+
+
+@pytest.fixture
+def ctrl(monkeypatch):
+    """StepperController wired to one end of a socketpair instead of arduino-router."""
+    monkeypatch.setattr(sca.StepperController, "_connect", lambda self: None)
+    monkeypatch.setattr(sca.StepperController, "_init_all_motors", lambda self: None)
+    controller = sca.StepperController()
+    sock, controller.router = socket.socketpair()
+    controller.sock = sock
+    controller._next_msg_id = itertools.count(1).__next__
+    yield controller
+    controller.cleanup()
+    sock.close()
+    controller.router.close()
+
+
+@pytest.fixture
+def router_path(ctrl, monkeypatch):
+    """Listening unix socket standing in for arduino-router's SOCKET_PATH."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "router.sock")
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        listener.listen(1)
+        monkeypatch.setattr(ctrl, "SOCKET_PATH", path)
+        yield listener
+        listener.close()
+
+
+def _serve(listener, handler):
+    """Accept one connection on a thread and answer each request with handler(request)."""
+    def run():
+        conn, _ = listener.accept()
+        with conn:
+            unpacker = msgpack.Unpacker(raw=False)
+            while data := conn.recv(4096):
+                unpacker.feed(data)
+                for request in unpacker:
+                    conn.sendall(handler(request))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+# ===================================================================
+# stop_motor / stop_all
+# ===================================================================
+
+class TestStop:
+    def test_stop_all_while_move_holds_lock(self, ctrl, router_path):
+        seen = []
+
+        def handler(request):
+            seen.append(request[2])
+            return _reply(request[1], 1)
+
+        _serve(router_path, handler)
+        # A move in progress holds self.lock until the MCU answers
+        with ctrl.lock:
+            assert ctrl.stop_all() is True
+            assert ctrl.stop_motor(2) is True
+        assert seen == ["stop_all", "stop"]
+
+    def test_stop_reuses_connection(self, ctrl, router_path):
+        _serve(router_path, lambda request: _reply(request[1], 1))
+        ctrl.stop_all()
+        sock = ctrl._stop_sock
+        ctrl.stop_all()
+        assert ctrl._stop_sock is sock
+
+    def test_stop_skips_stale_reply(self, ctrl, router_path):
+        _serve(router_path, lambda request: _reply(request[1] + 100, 0) + _reply(request[1], 1))
+        assert ctrl.stop_all() is True
+
+    def test_stop_rpc_error_returns_false(self, ctrl, router_path):
+        _serve(router_path, lambda request: _reply(request[1], error="busy"))
+        assert ctrl.stop_all() is False
+        assert ctrl._stop_sock is not None
+
+    def test_router_unreachable_returns_false(self, ctrl, monkeypatch):
+        monkeypatch.setattr(ctrl, "SOCKET_PATH", "/nonexistent/arduino-router.sock")
+        assert ctrl.stop_all() is False
+        assert ctrl._stop_sock is None
+
+    def test_router_closes_connection(self, ctrl, router_path):
+        def run():
+            conn, _ = router_path.accept()
+            _read_requests(conn, 1)
+            conn.close()
+
+        threading.Thread(target=run, daemon=True).start()
+        assert ctrl.stop_motor(1) is False
+        assert ctrl._stop_sock is None
+
+    def test_cleanup_closes_stop_connection(self, ctrl, router_path):
+        _serve(router_path, lambda request: _reply(request[1], 1))
+        ctrl.stop_all()
+        sock = ctrl._stop_sock
+        ctrl.cleanup()
+        assert ctrl._stop_sock is None
+        assert sock.fileno() == -1
+
+
+# ===================================================================
+# _parse_response
+# ===================================================================
+
+class TestParseResponse:
+    def test_result(self, ctrl):
+        assert ctrl._parse_response((1, 7, None, "pong")) == (7, "pong")
+
+    def test_wrong_length(self, ctrl, caplog):
+        assert ctrl._parse_response((1, 7, None)) == (None, None)
+        assert "Invalid response format" in caplog.text
+
+    def test_wrong_type(self, ctrl, caplog):
+        assert ctrl._parse_response((0, 7, None, 1)) == (7, None)
+        assert "Unexpected response type" in caplog.text
+
+    def test_error(self, ctrl, caplog):
+        assert ctrl._parse_response((1, 7, "no such method", None)) == (7, None)
+        assert "RPC error: no such method" in caplog.text
+
+
+# ===================================================================
+# _call_rpc
+# ===================================================================
+
+class TestCallRpc:
+    def test_sends_request_and_returns_result(self, ctrl):
+        ctrl.router.sendall(_reply(1, 1))
+        assert ctrl._call_rpc("init_motor", 3) == 1
+        assert _read_requests(ctrl.router, 1) == [[0, 1, "init_motor", [3]]]
+
+    def test_skips_stale_reply(self, ctrl):
+        # Late answer to an earlier call that timed out arrives first
+        ctrl.router.sendall(_reply(0, "late") + _reply(1, "pong"))
+        assert ctrl._call_rpc("ping") == "pong"
+
+    def test_invalid_response_returns_none(self, ctrl):
+        ctrl.router.sendall(msgpack.packb([1, 1]))
+        assert ctrl._call_rpc("ping") is None
+
+    def test_error_reply_returns_none(self, ctrl, caplog):
+        ctrl.router.sendall(_reply(1, error="bad args"))
+        assert ctrl._call_rpc("move", 1) is None
+        assert "RPC error: bad args" in caplog.text
+
+    def test_reply_split_across_reads(self, ctrl):
+        packed = _reply(1, "pong")
+
+        def send_rest():
+            ctrl.router.sendall(packed[2:])
+
+        ctrl.router.sendall(packed[:2])
+        threading.Timer(0.01, send_rest).start()
+        assert ctrl._call_rpc("ping") == "pong"
+
+    def test_extra_bytes_kept_for_next_call(self, ctrl):
+        ctrl.router.sendall(_reply(1, "a") + _reply(2, "b"))
+        assert ctrl._call_rpc("ping") == "a"
+        assert ctrl._call_rpc("ping") == "b"
+
+    def test_timeout_returns_none(self, ctrl):
+        assert ctrl._call_rpc("ping", timeout=0.01) is None
+        # The late reply is skipped by the next call
+        ctrl.router.sendall(_reply(1, "late") + _reply(2, "pong"))
+        assert ctrl._call_rpc("ping") == "pong"
+
+    def test_closed_connection_returns_none(self, ctrl):
+        ctrl.router.shutdown(socket.SHUT_WR)
+        assert ctrl._call_rpc("ping", log_errors=False) is None
+
+    def test_send_timeout_logged(self, ctrl, caplog):
+        ctrl.sock = _FailingSocket(socket.timeout())
+        assert ctrl._call_rpc("ping") is None
+        assert "RPC call 'ping' timed out" in caplog.text
+
+    def test_send_failure_logged(self, ctrl, caplog):
+        ctrl.sock = _FailingSocket(BrokenPipeError("gone"))
+        assert ctrl._call_rpc("ping") is None
+        assert "RPC call 'ping' failed: gone" in caplog.text
+
+    def test_failures_quiet_without_log_errors(self, ctrl, caplog):
+        ctrl.sock = _FailingSocket(socket.timeout())
+        assert ctrl._call_rpc("ping", log_errors=False) is None
+        ctrl.sock = _FailingSocket(BrokenPipeError("gone"))
+        assert ctrl._call_rpc("ping", log_errors=False) is None
+        assert caplog.text == ""
+
+    def test_timeout_set_only_when_changed(self, ctrl):
+        ctrl.sock = _TimeoutRecorder(ctrl.sock)
+        ctrl.router.sendall(_reply(1, 1) + _reply(2, 1) + _reply(3, 1))
+        ctrl._call_rpc("ping", timeout=2.0)
+        ctrl._call_rpc("ping", timeout=2.0)
+        ctrl._call_rpc("ping", timeout=3.0)
+        assert ctrl.sock.timeouts == [2.0, 3.0]
+
+
+# ===================================================================
+# _call_rpc_batch
+# ===================================================================
+
+class TestCallRpcBatch:
+    def test_single_send_in_call_order(self, ctrl):
+        ctrl.router.sendall(_reply(1, 1) + _reply(2, 0))
+        assert ctrl._call_rpc_batch([("init_motor", (1,)), ("init_motor", (2,))]) == [1, 0]
+        assert _read_requests(ctrl.router, 2) == [
+            [0, 1, "init_motor", [1]],
+            [0, 2, "init_motor", [2]],
+        ]
+
+    def test_out_of_order_replies(self, ctrl):
+        ctrl.router.sendall(_reply(3, "c") + _reply(1, "a") + _reply(2, "b"))
+        assert ctrl._call_rpc_batch([("m", ()), ("m", ()), ("m", ())]) == ["a", "b", "c"]
+
+    def test_stale_reply_dropped(self, ctrl):
+        ctrl.router.sendall(_reply(0, "late") + _reply(1, "a") + _reply(2, "b"))
+        assert ctrl._call_rpc_batch([("m", ()), ("m", ())]) == ["a", "b"]
+
+    def test_error_reply_is_none(self, ctrl):
+        ctrl.router.sendall(_reply(1, "a") + _reply(2, error="bad") + _reply(3, "c"))
+        assert ctrl._call_rpc_batch([("m", ()), ("m", ()), ("m", ())]) == ["a", None, "c"]
+
+    def test_timeout_keeps_received_results(self, ctrl):
+        ctrl.router.sendall(_reply(2, "b"))
+        assert ctrl._call_rpc_batch([("m", ()), ("m", ())], timeout=0.01) == [None, "b"]
+
+    def test_closed_connection(self, ctrl):
+        ctrl.router.sendall(_reply(1, "a"))
+        ctrl.router.shutdown(socket.SHUT_WR)
+        assert ctrl._call_rpc_batch([("m", ()), ("m", ())]) == ["a", None]
+
+    def test_empty_batch(self, ctrl):
+        assert ctrl._call_rpc_batch([]) == []
+
+    def test_send_timeout_logged(self, ctrl, caplog):
+        ctrl.sock = _FailingSocket(socket.timeout())
+        assert ctrl._call_rpc_batch([("m", ()), ("m", ())]) == [None, None]
+        assert "RPC batch of 2 calls timed out" in caplog.text
+
+    def test_send_failure_logged(self, ctrl, caplog):
+        ctrl.sock = _FailingSocket(BrokenPipeError("gone"))
+        assert ctrl._call_rpc_batch([("m", ())]) == [None]
+        assert "RPC batch of 1 calls failed: gone" in caplog.text